@@ -1,35 +1,78 @@
 from __future__ import annotations
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.const import Platform
+from homeassistant.helpers import entity_registry as er
 
-from .const import DOMAIN
+from .const import CONF_OPTIONAL_ENTITIES, DEFAULT_OPTIONAL_ENTITIES, DOMAIN
 from .coordinator import FioulBoilerCoordinator
+from .services import async_setup_services
+from .websocket_api import async_setup_websocket
 
 PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.BINARY_SENSOR]
 
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
-    """YAML setup is not supported."""
+    """YAML setup is not supported; only registers services and websocket commands."""
+    async_setup_services(hass)
+    async_setup_websocket(hass)
     return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up fioul boiler from a config entry."""
+    _async_migrate_optional_entities(hass, entry)
     coordinator = FioulBoilerCoordinator(hass, entry)
+    await coordinator.async_load_fuel()
+    await coordinator.async_load_summary()
+    entry.async_on_unload(coordinator.async_start_sources())
+    entry.async_on_unload(coordinator.async_start_daily_summary())
     await coordinator.async_config_entry_first_refresh()
 
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
     return True
 
 
+@callback
+def _async_migrate_optional_entities(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """
+    Pin ``optional_entities`` for entries created before the option existed.
+
+    Dort gab es ``flow_filtered`` immer; ist der Sensor registriert und
+    aktiviert, bleibt er erhalten. Läuft vor dem Update-Listener, löst
+    also kein Neuladen aus.
+    """
+    options = entry.options or {}
+    if CONF_OPTIONAL_ENTITIES in options:
+        return
+
+    optional = list(DEFAULT_OPTIONAL_ENTITIES)
+    registry = er.async_get(hass)
+    entity_id = registry.async_get_entity_id("sensor", DOMAIN, f"{entry.entry_id}_flow_filtered")
+    if entity_id is not None and not registry.async_get(entity_id).disabled:
+        optional.append("flow_filtered")
+
+    hass.config_entries.async_update_entry(
+        entry, options={**options, CONF_OPTIONAL_ENTITIES: optional}
+    )
+
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry so changed options are compiled once, not per tick."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok and DOMAIN in hass.data:
-        hass.data[DOMAIN].pop(entry.entry_id, None)
+        coordinator: FioulBoilerCoordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator.async_close_subscriptions()
+        await coordinator.async_save_fuel()
+        await coordinator.async_save_summary()
     return unload_ok
@@ -1,98 +1,65 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import NamedTuple, Optional
 
 from homeassistant.components.binary_sensor import (
     BinarySensorEntity,
     BinarySensorDeviceClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.core import HomeAssistant, callback
 
 from .const import DOMAIN
 from .coordinator import FioulBoilerCoordinator
+from .entity import FioulBoilerEntity, enabled_descriptions
 
 
-async def async_setup_entry(
-    hass: HomeAssistant, entry: ConfigEntry, async_add_entities
-) -> None:
-    """Set up Fioul boiler binary sensors from a config entry."""
-    coordinator: FioulBoilerCoordinator = hass.data[DOMAIN][entry.entry_id]
-
-    entities: list[BinarySensorEntity] = [
-        FioulBoilerGlobalErrorBinarySensor(coordinator, entry),
-        FioulBoilerPhcErrorBinarySensor(coordinator, entry),
-        FioulBoilerAbsenceErrorBinarySensor(coordinator, entry),
-        FioulBoilerBurnerRunningBinarySensor(coordinator, entry),
-    ]
-
-    async_add_entities(entities)
-
+class FioulBoilerBinarySensorDescription(NamedTuple):
+    """One row of the binary sensor table; ``key`` is also the coordinator data key."""
 
-class FioulBoilerBaseBinarySensor(
-    CoordinatorEntity[FioulBoilerCoordinator], BinarySensorEntity
-):
-    """Base class for Fioul boiler binary sensors."""
+    key: str
+    device_class: BinarySensorDeviceClass
+    optional: Optional[str] = None
 
-    _attr_has_entity_name = True
-
-    def __init__(self, coordinator: FioulBoilerCoordinator, entry: ConfigEntry) -> None:
-        super().__init__(coordinator)
-        self._entry = entry
-        self._attr_unique_id = f"{entry.entry_id}_{self.translation_key}"
-
-    @property
-    def device_info(self) -> dict[str, Any]:
-        return {
-            "identifiers": {(DOMAIN, self._entry.entry_id)},
-            "name": "Fioul boiler",
-        }
-
-
-class FioulBoilerGlobalErrorBinarySensor(FioulBoilerBaseBinarySensor):
-    _attr_device_class = BinarySensorDeviceClass.PROBLEM
-
-    @property
-    def translation_key(self) -> str:
-        return "error_global"
-
-    @property
-    def is_on(self) -> bool:
-        return bool(self.coordinator.data.get("error_global"))
 
+BINARY_SENSORS: tuple[FioulBoilerBinarySensorDescription, ...] = (
+    FioulBoilerBinarySensorDescription("error_global", BinarySensorDeviceClass.PROBLEM),
+    FioulBoilerBinarySensorDescription("error_phc", BinarySensorDeviceClass.PROBLEM),
+    FioulBoilerBinarySensorDescription("error_absence", BinarySensorDeviceClass.PROBLEM),
+    FioulBoilerBinarySensorDescription("burner_running", BinarySensorDeviceClass.POWER),
+)
 
-class FioulBoilerPhcErrorBinarySensor(FioulBoilerBaseBinarySensor):
-    _attr_device_class = BinarySensorDeviceClass.PROBLEM
-
-    @property
-    def translation_key(self) -> str:
-        return "error_phc"
-
-    @property
-    def is_on(self) -> bool:
-        return bool(self.coordinator.data.get("error_phc"))
 
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities
+) -> None:
+    """Set up Fioul boiler binary sensors from a config entry."""
+    coordinator: FioulBoilerCoordinator = hass.data[DOMAIN][entry.entry_id]
+    async_add_entities(async_build_binary_sensors(coordinator))
 
-class FioulBoilerAbsenceErrorBinarySensor(FioulBoilerBaseBinarySensor):
-    _attr_device_class = BinarySensorDeviceClass.PROBLEM
 
-    @property
-    def translation_key(self) -> str:
-        return "error_absence"
+@callback
+def async_build_binary_sensors(coordinator: FioulBoilerCoordinator) -> list[BinarySensorEntity]:
+    """Create the enabled binary sensors."""
+    return [
+        FioulBoilerBinarySensor(coordinator, description)
+        for description in enabled_descriptions(coordinator, BINARY_SENSORS)
+    ]
 
-    @property
-    def is_on(self) -> bool:
-        return bool(self.coordinator.data.get("error_absence"))
 
+class FioulBoilerBinarySensor(FioulBoilerEntity, BinarySensorEntity):
+    """Boolean coordinator value."""
 
-class FioulBoilerBurnerRunningBinarySensor(FioulBoilerBaseBinarySensor):
-    _attr_device_class = BinarySensorDeviceClass.POWER
+    description: FioulBoilerBinarySensorDescription
 
-    @property
-    def translation_key(self) -> str:
-        return "burner_running"
+    def __init__(
+        self,
+        coordinator: FioulBoilerCoordinator,
+        description: FioulBoilerBinarySensorDescription,
+    ) -> None:
+        super().__init__(coordinator, description)
+        self._attr_device_class = description.device_class
 
     @property
     def is_on(self) -> bool:
-        return bool(self.coordinator.data.get("burner_running"))
+        return bool(self.coordinator.data.get(self.description.key))
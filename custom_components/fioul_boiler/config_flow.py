@@ -1,24 +1,43 @@
 from __future__ import annotations
 
 from typing import Any
+import json
 
 import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.core import callback
 from homeassistant.helpers.selector import selector
+from homeassistant.util import dt as dt_util
 
 from .const import (
     DOMAIN,
-    CONF_POWER_SENSOR,
+    CONF_POWER_SENSORS,
+    CONF_SOURCE_WEIGHTS,
     CONF_LPH_RUN,
     CONF_DEBOUNCE,
     CONF_KWH_PER_LITER,
+    CONF_FLOW_TABLE,
+    CONF_FLOW_INTERPOLATE,
+    CONF_PUBLISH_WINDOW,
+    CONF_SHADOWS,
+    CONF_STALE_TIMEOUT,
+    CONF_GAP_POLICY,
+    CONF_OPTIONAL_ENTITIES,
     DEFAULT_LPH_RUN,
     DEFAULT_DEBOUNCE,
     DEFAULT_KWH_PER_LITER,
+    DEFAULT_PUBLISH_WINDOW,
+    DEFAULT_STALE_TIMEOUT,
+    DEFAULT_GAP_POLICY,
+    DEFAULT_OPTIONAL_ENTITIES,
+    DEFAULT_SOURCE_WEIGHT,
     DEFAULT_THRESHOLDS,
+    GAP_POLICIES,
+    OPTIONAL_ENTITIES,
 )
+from .flow_model import format_flow_table, parse_flow_table
+from .shadow import ShadowEvaluator, parse_shadow_configs
 
 
 class FioulBoilerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -26,27 +45,41 @@ class FioulBoilerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    def __init__(self) -> None:
+        self._data: dict[str, Any] = {}
+
     async def async_step_user(self, user_input: dict[str, Any] | None = None):
         errors: dict[str, str] = {}
 
         if user_input is not None:
+            sources: list[str] = user_input[CONF_POWER_SENSORS]
+            if not sources:
+                errors[CONF_POWER_SENSORS] = "no_source"
             if user_input[CONF_LPH_RUN] <= 0:
                 errors[CONF_LPH_RUN] = "invalid_lph"
             if user_input[CONF_DEBOUNCE] < 0:
                 errors[CONF_DEBOUNCE] = "invalid_debounce"
 
             if not errors:
-                await self.async_set_unique_id(f"fioul_boiler_{user_input[CONF_POWER_SENSOR]}")
+                # Single source keeps the historical unique id format
+                await self.async_set_unique_id(f"fioul_boiler_{'+'.join(sorted(sources))}")
                 self._abort_if_unique_id_configured()
-                return self.async_create_entry(title="Fioul Boiler", data=user_input)
+                self._data = dict(user_input)
+
+                if len(sources) > 1:
+                    return await self.async_step_sources()
+
+                self._data[CONF_SOURCE_WEIGHTS] = {sources[0]: DEFAULT_SOURCE_WEIGHT}
+                return self.async_create_entry(title="Fioul Boiler", data=self._data)
 
         schema = vol.Schema(
             {
-                vol.Required(CONF_POWER_SENSOR): selector(
+                vol.Required(CONF_POWER_SENSORS): selector(
                     {
                         "entity": {
                             "domain": "sensor",
                             "device_class": "power",
+                            "multiple": True,
                         }
                     }
                 ),
@@ -57,6 +90,29 @@ class FioulBoilerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         return self.async_show_form(step_id="user", data_schema=schema, errors=errors)
 
+    async def async_step_sources(self, user_input: dict[str, Any] | None = None):
+        """Weight of each power source in the fused power value."""
+        sources: list[str] = self._data[CONF_POWER_SENSORS]
+
+        if user_input is not None:
+            self._data[CONF_SOURCE_WEIGHTS] = {
+                entity_id: float(user_input[entity_id]) for entity_id in sources
+            }
+            return self.async_create_entry(title="Fioul Boiler", data=self._data)
+
+        schema = vol.Schema(
+            {
+                vol.Optional(entity_id, default=DEFAULT_SOURCE_WEIGHT): vol.Coerce(float)
+                for entity_id in sources
+            }
+        )
+
+        return self.async_show_form(
+            step_id="sources",
+            data_schema=schema,
+            description_placeholders={"count": str(len(sources))},
+        )
+
     @staticmethod
     @callback
     def async_get_options_flow(config_entry: config_entries.ConfigEntry):
@@ -70,7 +126,19 @@ class FioulBoilerOptionsFlowHandler(config_entries.OptionsFlow):
         self._entry = config_entry
 
     async def async_step_init(self, user_input: dict[str, Any] | None = None):
+        errors: dict[str, str] = {}
+
         if user_input is not None:
+            try:
+                flow_table = parse_flow_table(user_input.get(CONF_FLOW_TABLE, ""))
+            except ValueError:
+                errors[CONF_FLOW_TABLE] = "invalid_flow_table"
+            try:
+                shadows = parse_shadow_configs(user_input.get(CONF_SHADOWS, ""))
+            except ValueError:
+                errors[CONF_SHADOWS] = "invalid_shadows"
+
+        if user_input is not None and not errors:
             thresholds = {
                 "arret": float(user_input["arret"]),
                 "nuit": float(user_input["nuit"]),
@@ -83,9 +151,22 @@ class FioulBoilerOptionsFlowHandler(config_entries.OptionsFlow):
                 CONF_LPH_RUN: float(user_input[CONF_LPH_RUN]),
                 CONF_DEBOUNCE: int(user_input[CONF_DEBOUNCE]),
                 CONF_KWH_PER_LITER: float(user_input[CONF_KWH_PER_LITER]),
+                CONF_FLOW_TABLE: flow_table,
+                CONF_FLOW_INTERPOLATE: bool(user_input[CONF_FLOW_INTERPOLATE]),
+                CONF_PUBLISH_WINDOW: int(user_input[CONF_PUBLISH_WINDOW]),
+                CONF_SHADOWS: shadows,
+                CONF_STALE_TIMEOUT: int(user_input[CONF_STALE_TIMEOUT]),
+                CONF_GAP_POLICY: user_input[CONF_GAP_POLICY],
+                CONF_OPTIONAL_ENTITIES: list(user_input[CONF_OPTIONAL_ENTITIES]),
                 "thresholds": thresholds,
             }
-            return self.async_create_entry(title="", data=options)
+            # Schatten-Engines zur Probe bauen, damit Fehler hier erscheinen
+            shadow_check = ShadowEvaluator(self._entry.data, options, shadows)
+            shadow_check.step(dt_util.utcnow(), 0.0, {"delta_liters": 0.0, "cycle_completed": None})
+            if shadow_check.failed:
+                errors[CONF_SHADOWS] = "invalid_shadows"
+            else:
+                return self.async_create_entry(title="", data=options)
 
         data = self._entry.options or {}
         thresholds = {**DEFAULT_THRESHOLDS, **data.get("thresholds", {})}
@@ -104,6 +185,36 @@ class FioulBoilerOptionsFlowHandler(config_entries.OptionsFlow):
                     CONF_KWH_PER_LITER,
                     default=data.get(CONF_KWH_PER_LITER, DEFAULT_KWH_PER_LITER),
                 ): vol.Coerce(float),
+                vol.Optional(
+                    CONF_FLOW_TABLE,
+                    default=format_flow_table(data.get(CONF_FLOW_TABLE) or []),
+                ): str,
+                vol.Optional(
+                    CONF_FLOW_INTERPOLATE,
+                    default=data.get(CONF_FLOW_INTERPOLATE, False),
+                ): bool,
+                vol.Optional(
+                    CONF_PUBLISH_WINDOW,
+                    default=data.get(CONF_PUBLISH_WINDOW, DEFAULT_PUBLISH_WINDOW),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_SHADOWS,
+                    default=json.dumps(data[CONF_SHADOWS]) if data.get(CONF_SHADOWS) else "",
+                ): str,
+                vol.Optional(
+                    CONF_STALE_TIMEOUT,
+                    default=data.get(CONF_STALE_TIMEOUT, DEFAULT_STALE_TIMEOUT),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_GAP_POLICY,
+                    default=data.get(CONF_GAP_POLICY, DEFAULT_GAP_POLICY),
+                ): vol.In(GAP_POLICIES),
+                vol.Optional(
+                    CONF_OPTIONAL_ENTITIES,
+                    default=data.get(CONF_OPTIONAL_ENTITIES, DEFAULT_OPTIONAL_ENTITIES),
+                ): selector(
+                    {"select": {"options": list(OPTIONAL_ENTITIES), "multiple": True}}
+                ),
                 vol.Optional("arret", default=thresholds["arret"]): vol.Coerce(float),
                 vol.Optional("nuit", default=thresholds["nuit"]): vol.Coerce(float),
                 vol.Optional("pompe", default=thresholds["pompe"]): vol.Coerce(float),
@@ -113,4 +224,4 @@ class FioulBoilerOptionsFlowHandler(config_entries.OptionsFlow):
             }
         )
 
-        return self.async_show_form(step_id="init", data_schema=schema)
+        return self.async_show_form(step_id="init", data_schema=schema, errors=errors)
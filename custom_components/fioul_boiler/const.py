@@ -2,13 +2,25 @@ from __future__ import annotations
 
 DOMAIN = "fioul_boiler"
 
-CONF_POWER_SENSOR = "power_sensor"
+CONF_POWER_SENSOR = "power_sensor"  # legacy single-source entries
+CONF_POWER_SENSORS = "power_sensors"
+CONF_SOURCE_WEIGHTS = "source_weights"
 CONF_LPH_RUN = "lph_run"
 CONF_DEBOUNCE = "debounce"
 CONF_KWH_PER_LITER = "kwh_per_liter"
+CONF_FLOW_TABLE = "flow_table"
+CONF_FLOW_INTERPOLATE = "flow_interpolate"
+CONF_PUBLISH_WINDOW = "publish_window"
+CONF_SHADOWS = "shadows"
+CONF_STALE_TIMEOUT = "stale_timeout"
+CONF_GAP_POLICY = "gap_policy"
+CONF_OPTIONAL_ENTITIES = "optional_entities"
 
 DEFAULT_LPH_RUN = 2.1
 DEFAULT_DEBOUNCE = 10
+DEFAULT_SOURCE_WEIGHT = 1.0
+DEFAULT_PUBLISH_WINDOW = 0  # s, 0 = live
+DEFAULT_STALE_TIMEOUT = 0  # s, 0 = nur unavailable/unknown gilt als Lücke
 DEFAULT_KWH_PER_LITER = 10.0  # Durchschnittlicher Brennwert von Heizöl (~10 kWh/L)
 
 # Default thresholds in Watt
@@ -29,3 +41,65 @@ STATE_PRECH = "Pré-chauffage"
 STATE_POST = "Post-circulation"
 STATE_BURN = "Brûleur en marche"
 STATE_HORS = "Hors plage"
+
+# Kurzschlüssel je Zustand (Export, Zusammenfassungen)
+STATE_KEYS: dict[str, str] = {
+    STATE_ARRET: "arret",
+    STATE_NUIT: "nuit",
+    STATE_POMPE: "pompe",
+    STATE_PRECH: "prechauffage",
+    STATE_POST: "postcirc",
+    STATE_BURN: "burn",
+    STATE_HORS: "hors",
+}
+
+# Optionale Entitäten (Gruppen), nur auf Wunsch angelegt
+OPTIONAL_ENTITIES = ("cost", "flow_filtered")
+DEFAULT_OPTIONAL_ENTITIES = ["cost"]
+
+# Umgang mit Lücken der Leistungsquelle
+GAP_HOLD = "hold"
+GAP_INTERPOLATE = "interpolate"
+GAP_DISCARD = "discard"
+GAP_POLICIES = (GAP_HOLD, GAP_INTERPOLATE, GAP_DISCARD)
+DEFAULT_GAP_POLICY = GAP_HOLD
+GAP_INTERPOLATE_MAX_S = 3600  # längere Lücken werden verworfen statt überbrückt
+GAP_HOLD_MAX_S = 900  # hold: danach wird eingefroren und verworfen wie bei discard
+
+# Heizöl-Lieferungen
+FUEL_STORAGE_VERSION = 1
+FUEL_SAVE_DELAY = 30  # s
+
+# Laufende Tageszusammenfassung (überlebt Neustart und Neuladen)
+SUMMARY_STORAGE_VERSION = 1
+SUMMARY_SAVE_INTERVAL = 300  # s
+
+# Bereits gebuchte Nachberechnungs-Korrekturen
+CORRECTIONS_STORAGE_VERSION = 1
+
+# Events
+EVENT_CYCLE_COMPLETED = f"{DOMAIN}_cycle_completed"
+EVENT_FAULT = f"{DOMAIN}_fault"
+EVENT_DAILY_SUMMARY = f"{DOMAIN}_daily_summary"
+
+# Zeitleiste der letzten Brennzyklen (im Speicher)
+CYCLE_HISTORY_SIZE = 200
+
+# Schatten-Konfigurationen: Tage in den Diagnosedaten
+SHADOW_HISTORY_DAYS = 14
+
+# Services
+SERVICE_EXPORT = "export"
+SERVICE_RECOMPUTE = "recompute"
+SERVICE_ADD_DELIVERY = "add_delivery"
+
+ATTR_ENTRY_ID = "entry_id"
+ATTR_START_DATE = "start_date"
+ATTR_END_DATE = "end_date"
+ATTR_FORMAT = "format"
+ATTR_FILENAME = "filename"
+ATTR_LITERS = "liters"
+ATTR_PRICE_PER_LITER = "price_per_liter"
+ATTR_DATE = "date"
+
+EXPORT_FORMATS = ("csv", "parquet")
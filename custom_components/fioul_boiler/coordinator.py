@@ -1,30 +1,44 @@
 from __future__ import annotations
 
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 import logging
 
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.event import async_track_time_change
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util import dt as dt_util
 
 from .const import (
-    CONF_POWER_SENSOR,
-    CONF_LPH_RUN,
-    CONF_DEBOUNCE,
-    CONF_KWH_PER_LITER,
-    DEFAULT_LPH_RUN,
-    DEFAULT_DEBOUNCE,
-    DEFAULT_KWH_PER_LITER,
-    DEFAULT_THRESHOLDS,
-    STATE_ARRET,
-    STATE_NUIT,
-    STATE_POMPE,
-    STATE_PRECH,
-    STATE_POST,
-    STATE_BURN,
-    STATE_HORS,
+    DOMAIN,
+    CONF_PUBLISH_WINDOW,
+    CONF_SHADOWS,
+    CONF_STALE_TIMEOUT,
+    CONF_GAP_POLICY,
+    DEFAULT_PUBLISH_WINDOW,
+    DEFAULT_STALE_TIMEOUT,
+    DEFAULT_GAP_POLICY,
+    GAP_HOLD,
+    GAP_HOLD_MAX_S,
+    GAP_INTERPOLATE,
+    GAP_INTERPOLATE_MAX_S,
+    FUEL_STORAGE_VERSION,
+    FUEL_SAVE_DELAY,
+    SUMMARY_STORAGE_VERSION,
+    SUMMARY_SAVE_INTERVAL,
+    EVENT_CYCLE_COMPLETED,
+    EVENT_FAULT,
+    EVENT_DAILY_SUMMARY,
+    CYCLE_HISTORY_SIZE,
 )
+from .engine import BoilerEngine
+from .fuel import FuelLedger
+from .power_source import PowerSourceFusion, get_source_weights
+from .shadow import ShadowEvaluator
+from .summary import DailySummary
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -39,41 +53,80 @@ class FioulBoilerCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     berechnet – exakt wie bei einer echten Brennerlaufzeit-Auswertung.
     """
 
-    def __init__(self, hass: HomeAssistant, entry) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry,
+        clock: Optional[Callable[[], datetime]] = None,
+    ) -> None:
         self.hass = hass
         self.entry = entry
 
-        self.power_entity_id: str = entry.data[CONF_POWER_SENSOR]
+        # Zeitquelle (virtuelle Uhr in der Simulation)
+        self._clock = clock or dt_util.utcnow
+
+        # Ein gemeinsames Geräteobjekt für alle Entitäten des Eintrags
+        self.device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            name="Fioul boiler",
+        )
+
+        # Eine oder mehrere Leistungsquellen, gewichtet zu einem Wert fusioniert
+        self.sources = PowerSourceFusion(hass, get_source_weights(entry.data))
 
         opts = entry.options or {}
-        self.lph_run = opts.get(CONF_LPH_RUN, entry.data.get(CONF_LPH_RUN, DEFAULT_LPH_RUN))
-        self.debounce = opts.get(CONF_DEBOUNCE, entry.data.get(CONF_DEBOUNCE, DEFAULT_DEBOUNCE))
-        self.kwh_per_liter = opts.get(CONF_KWH_PER_LITER, DEFAULT_KWH_PER_LITER)
 
-        # Threshold overrides
-        thresholds_opt = opts.get("thresholds") or {}
-        self.thresholds: dict[str, float] = {**DEFAULT_THRESHOLDS, **thresholds_opt}
+        # Zustandsmaschine (Schwellen, Debounce, Fehler, Brenner-Phasen)
+        self.engine = BoilerEngine.from_entry_data(entry.data, opts)
+
+        # Alternative Konfigurationen, die nur mitlaufen (Diagnose)
+        shadow_configs = opts.get(CONF_SHADOWS) or {}
+        self.shadows: Optional[ShadowEvaluator] = (
+            ShadowEvaluator(entry.data, opts, shadow_configs) if shadow_configs else None
+        )
+
+        # Messwert-Sensoren: 0 = jeden Tick schreiben, sonst einmal pro Fenster (s)
+        self.publish_window: int = opts.get(CONF_PUBLISH_WINDOW, DEFAULT_PUBLISH_WINDOW)
+
+        # Lücken der Leistungsquelle: Erkennung, Strategie, Statistik
+        self.stale_timeout: int = opts.get(CONF_STALE_TIMEOUT, DEFAULT_STALE_TIMEOUT)
+        self.gap_policy: str = opts.get(CONF_GAP_POLICY, DEFAULT_GAP_POLICY)
+        self._gap_start: Optional[datetime] = None
+        self._gap_power = 0.0
+        # Beginn des eingefrorenen Teils der laufenden Lücke
+        self._frozen_since: Optional[datetime] = None
+        self.gaps: dict[str, Any] = {
+            "policy": self.gap_policy,
+            "count": 0,
+            "total_s": 0.0,
+            "longest_s": 0.0,
+            "last_start": None,
+            "last_end": None,
+        }
 
-        # Time/state tracking
-        self._last_update: Optional[datetime] = None
-        self._last_raw_state: str = STATE_ARRET
-        self._last_raw_state_change: Optional[datetime] = None
+        # Persistente Zähler-Sensoren (für Nachberechnungen) und deren Sperre
+        self.accumulators: list[Any] = []
+        self.recompute_running = False
 
-        # Debounced state
-        self._last_state_filtered: str = STATE_ARRET
-        self._last_state_filtered_change: Optional[datetime] = None
+        # Heizöl-Lieferungen (FIFO) für die Kostenberechnung
+        self.fuel = FuelLedger()
+        self._fuel_store: Store[dict[str, Any]] = Store(
+            hass, FUEL_STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.fuel"
+        )
 
-        # PHC error tracking
-        self._phc_pending = False
-        self._phc_check_base_time: Optional[datetime] = None
-        self._phc_error = False
+        # Ereignisse: Tageszusammenfassung und letzte Fehlerzustände (Flanken)
+        self._summary = DailySummary()
+        self._summary_store: Store[dict[str, Any]] = Store(
+            hass, SUMMARY_STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.summary"
+        )
+        self._summary_saved: Optional[datetime] = None
+        self._faults: Optional[dict[str, bool]] = None
 
-        # Last valid Burn
-        self._burn_last_ok: Optional[datetime] = None
+        # Letzte abgeschlossene Zyklen (Zeitleiste für Dashboards)
+        self.cycles: deque[dict[str, Any]] = deque(maxlen=CYCLE_HISTORY_SIZE)
 
-        # Echte Burn-Phasen (manueller Zähler-Modus)
-        self._burn_active = False
-        self._burn_start_time: Optional[datetime] = None
+        # Offene WebSocket-Abos; werden beim Entladen des Eintrags beendet
+        self.subscriptions: set[CALLBACK_TYPE] = set()
 
         super().__init__(
             hass,
@@ -82,176 +135,229 @@ class FioulBoilerCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             update_interval=timedelta(seconds=1),
         )
 
-    async def _async_update_data(self) -> dict[str, Any]:
-        now = datetime.utcnow()
+    @callback
+    def async_start_sources(self) -> CALLBACK_TYPE:
+        """Subscribe to the power sources. Returns the unsubscribe callback."""
+        return self.sources.async_start()
 
-        # --------------------------------------
-        # POWER EINLESEN
-        # --------------------------------------
-        state_obj = self.hass.states.get(self.power_entity_id)
-        if state_obj is None or state_obj.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
-            power = 0.0
-        else:
-            try:
-                power = float(state_obj.state)
-            except Exception as err:
-                raise UpdateFailed(f"Invalid power value: {state_obj.state}") from err
+    @callback
+    def async_start_daily_summary(self) -> CALLBACK_TYPE:
+        """Fire the daily summary event at local midnight."""
+        return async_track_time_change(
+            self.hass, self._async_midnight, hour=0, minute=0, second=0
+        )
 
-        t = self.thresholds
+    @callback
+    def _async_midnight(self, now: datetime) -> None:
+        day = (dt_util.as_local(now) - timedelta(seconds=1)).date()
+        summary = self._summary.pop(day, dt_util.as_utc(now))
+        self.hass.bus.async_fire(EVENT_DAILY_SUMMARY, {**self._event_base(), **summary})
+        self._summary_store.async_delay_save(self._summary.as_dict, SUMMARY_SAVE_INTERVAL)
+        self._summary_saved = dt_util.as_utc(now)
+
+    @callback
+    def _async_summary_add(self, now: datetime, data: dict[str, Any]) -> None:
+        """
+        Feed the daily summary and keep a save pending.
+
+        Höchstens eine verzögerte Sicherung pro Intervall; sie liest den
+        Stand erst beim Schreiben und wird beim Beenden von HA sofort
+        geschrieben.
+        """
+        self._summary.add(now, data)
+        saved = self._summary_saved
+        if saved is None or (now - saved).total_seconds() >= SUMMARY_SAVE_INTERVAL:
+            self._summary_store.async_delay_save(self._summary.as_dict, SUMMARY_SAVE_INTERVAL)
+            self._summary_saved = now
+
+    def _event_base(self) -> dict[str, Any]:
+        return {"entry_id": self.entry.entry_id, "name": self.entry.title}
+
+    @callback
+    def _async_fire_events(self, data: dict[str, Any]) -> None:
+        """Fire bus events once per occurrence: completed cycle, fault edges."""
+        bus = self.hass.bus
+
+        cycle = data["cycle_completed"]
+        if cycle is not None:
+            completed = {
+                "start": cycle["start"].isoformat(),
+                "end": cycle["end"].isoformat(),
+                "duration_s": round(cycle["duration_s"], 1),
+                "preheat_s": round(cycle["preheat_s"], 1),
+                "liters": round(cycle["liters"], 3),
+                "energy_kwh": round(cycle["energy_kwh"], 3),
+                "cost": round(data["delta_cost"], 2),
+            }
+            self.cycles.append(completed)
+            bus.async_fire(EVENT_CYCLE_COMPLETED, {**self._event_base(), **completed})
+
+        faults = {"phc": data["error_phc"], "absence": data["error_absence"]}
+        previous = self._faults
+        self._faults = faults
+        if previous is None:
+            # Erster Tick: Ausgangszustand, keine Flanke
+            return
+
+        for fault, active in faults.items():
+            if active == previous[fault]:
+                continue
+            if active:
+                self._summary.add_fault(fault)
+            bus.async_fire(EVENT_FAULT, {**self._event_base(), "fault": fault, "active": active})
+
+    @callback
+    def async_close_subscriptions(self) -> None:
+        """End all websocket subscriptions to this coordinator (entry unload/reload)."""
+        for close in list(self.subscriptions):
+            close()
+
+    async def async_load_fuel(self) -> None:
+        """Restore the delivery lots from storage."""
+        if (stored := await self._fuel_store.async_load()) is not None:
+            self.fuel.load(stored)
+
+    async def async_save_fuel(self) -> None:
+        """Write the lots now; a delayed save would race the next setup after a reload."""
+        await self._fuel_store.async_save(self.fuel.as_dict())
+
+    async def async_load_summary(self) -> None:
+        """Restore today's running summary totals."""
+        if (stored := await self._summary_store.async_load()) is not None:
+            self._summary.load(stored, self._clock())
+
+    async def async_save_summary(self) -> None:
+        """Write the running summary now (unload/reload)."""
+        await self._summary_store.async_save(self._summary.as_dict())
+
+    @callback
+    def async_add_fuel_lot(self, liters: float, price_per_liter: float, delivered: str) -> None:
+        """Record an oil delivery."""
+        self.fuel.add_lot(liters, price_per_liter, delivered)
+        self._fuel_store.async_delay_save(self.fuel.as_dict, FUEL_SAVE_DELAY)
+
+    def _gap_opened(self, now: datetime, power: float) -> None:
+        self._gap_start = now
+        self._gap_power = power
+        self.gaps["count"] += 1
+        self.gaps["last_start"] = now.isoformat()
+        _LOGGER.debug(
+            "%s: power source gap (%s), policy %s",
+            self.entry.title, self.sources.missing or "stale", self.gap_policy,
+        )
 
-        # --------------------------------------
-        # ROH-ZUSTAND ERMITTELN
-        # --------------------------------------
-        if power < t["arret"]:
-            state_raw = STATE_ARRET
-        elif power < t["nuit"]:
-            state_raw = STATE_NUIT
-        elif power < t["pompe"]:
-            state_raw = STATE_POMPE
-        elif power < t["prechauffage"]:
-            state_raw = STATE_PRECH
-        elif power < t["postcirc"]:
-            state_raw = STATE_POST
-        elif power <= t["burn_max"]:
-            state_raw = STATE_BURN
-        else:
-            state_raw = STATE_HORS
-
-        # Roh-Zustand Tracking
-        if self._last_raw_state_change is None or state_raw != self._last_raw_state:
-            self._last_raw_state = state_raw
-            self._last_raw_state_change = now
+    def _gap_closed(self, now: datetime) -> float:
+        duration = (now - self._gap_start).total_seconds()
+        self._gap_start = None
+        gaps = self.gaps
+        gaps["total_s"] = round(gaps["total_s"] + duration, 1)
+        gaps["longest_s"] = max(gaps["longest_s"], round(duration, 1))
+        gaps["last_end"] = now.isoformat()
+        return duration
+
+    def _bridge_gap(self, start: datetime, now: datetime, power: float) -> dict[str, Any]:
+        """
+        Step the engines through ``[start, now)`` at 1 Hz with power ramped
+        linearly from the last value before the gap to ``power``.
+
+        Eine monotone Rampe beendet höchstens einen Burn-Zyklus.
+        """
+        bridged: dict[str, Any] = {
+            "delta_liters": 0.0,
+            "delta_energy_kwh": 0.0,
+            "cycle_completed": None,
+        }
+        seconds = int((now - start).total_seconds())
+        p0 = self._gap_power
+        for i in range(seconds):
+            t = start + timedelta(seconds=i)
+            p = p0 + (power - p0) * i / seconds
+            step = self.engine.step(t, p)
+            if self.shadows is not None:
+                self.shadows.step(t, p, step)
+            bridged["delta_liters"] += step["delta_liters"]
+            bridged["delta_energy_kwh"] += step["delta_energy_kwh"]
+            if step["cycle_completed"] is not None:
+                bridged["cycle_completed"] = step["cycle_completed"]
+        return bridged
 
-        # --------------------------------------
-        # DEBOUNCE-FILTERUNG
-        # --------------------------------------
-        prev_data = self.data or {}
-        prev_filtered = prev_data.get("state_filtered", state_raw)
-
-        if self._last_raw_state_change is None:
-            state_filtered = state_raw
-        else:
-            elapsed_raw = (now - self._last_raw_state_change).total_seconds()
-            if elapsed_raw >= self.debounce:
-                state_filtered = self._last_raw_state
-            else:
-                state_filtered = prev_filtered
-
-        # Track filtered state change
-        if self._last_state_filtered_change is None:
-            self._last_state_filtered = state_filtered
-            self._last_state_filtered_change = now
-
-        elif state_filtered != self._last_state_filtered:
-            prev_state = self._last_state_filtered
-            prev_duration = (now - self._last_state_filtered_change).total_seconds()
-
-            # PHC: Pré-chauffage lange genug → pending
-            if prev_state == STATE_PRECH and prev_duration >= 15.0:
-                self._phc_pending = True
-                self._phc_check_base_time = now
-                self._phc_error = False
-
-            self._last_state_filtered = state_filtered
-            self._last_state_filtered_change = now
+    async def _async_update_data(self) -> dict[str, Any]:
+        now = self._clock()
 
         # --------------------------------------
-        # PHC EVAL NACH 2 MIN
+        # POWER EINLESEN & LÜCKEN
         # --------------------------------------
-        if self._phc_pending and self._phc_check_base_time:
-            check_time = self._phc_check_base_time + timedelta(minutes=2)
-            if now >= check_time:
-                if state_filtered == STATE_BURN and self._last_state_filtered_change:
-                    burn_duration = (now - self._last_state_filtered_change).total_seconds()
-                    if burn_duration >= 20.0:
-                        self._phc_error = False
-                        self._burn_last_ok = now
-                    else:
-                        self._phc_error = True
-                else:
-                    self._phc_error = True
-
-                self._phc_pending = False
-                self._phc_check_base_time = None
+        # Fehlende Quellen behalten ihren letzten Wert (kein 0 W, kein UpdateFailed)
+        power = self.sources.power
+        in_gap = self.sources.in_gap(now, self.stale_timeout)
+        bridged: Optional[dict[str, Any]] = None
+
+        if in_gap:
+            if self._gap_start is None:
+                self._gap_opened(now, power)
+            # hold nur begrenzt: sonst bucht ein Ausfall mitten im Burn endlos lph_run
+            held = (
+                self.gap_policy == GAP_HOLD
+                and (now - self._gap_start).total_seconds() <= GAP_HOLD_MAX_S
+            )
+            if not held and self.data is not None:
+                if self._frozen_since is None:
+                    self._frozen_since = now
+                # Intervall einfrieren: letzter Zustand, keine Deltas, keine Zusammenfassung
+                data = {
+                    **self.data,
+                    "delta_liters": 0.0,
+                    "delta_energy_kwh": 0.0,
+                    "delta_cost": 0.0,
+                    "cycle_completed": None,
+                    "source_gap": True,
+                }
+                self._summary.skip(now)
+                return data
+        elif self._gap_start is not None:
+            start = self._gap_start
+            frozen_since, self._frozen_since = self._frozen_since, None
+            duration = self._gap_closed(now)
+            if self.gap_policy == GAP_INTERPOLATE and duration <= GAP_INTERPOLATE_MAX_S:
+                bridged = self._bridge_gap(start, now, power)
+            elif frozen_since is not None:
+                # Verwerfen: den eingefrorenen Teil aus der Zeitachse der Engines schneiden
+                offset = now - frozen_since
+                self.engine.shift(offset)
+                if self.shadows is not None:
+                    self.shadows.shift(offset)
 
         # --------------------------------------
-        # >1H ABSENCE-LOGIK
+        # ZUSTAND, FEHLER & DELTAS
         # --------------------------------------
-        if state_filtered in (STATE_ARRET, STATE_NUIT):
-            error_absence = False
-        else:
-            if self._burn_last_ok is None:
-                error_absence = True
-            else:
-                error_absence = (now - self._burn_last_ok) > timedelta(hours=1)
-
-        error_phc = self._phc_error
-        error_global = error_phc or error_absence
+        data = self.engine.step(now, power)
+        if self.shadows is not None:
+            self.shadows.step(now, power, data)
+        data["source_gap"] = in_gap
 
-        # --------------------------------------
-        # KLASSISCHE BRENNER-PHASEN-LOGIK
-        # --------------------------------------
-        delta_liters = 0.0
-        delta_energy_kwh = 0.0
-
-        # 1. Start einer Burn-Phase
-        if state_filtered == STATE_BURN and not self._burn_active:
-            self._burn_active = True
-            self._burn_start_time = now
-
-        # 2. Ende einer Burn-Phase → Verbrauch berechnen
-        if self._burn_active and state_filtered != STATE_BURN:
-            if self._burn_start_time:
-                burn_hours = (now - self._burn_start_time).total_seconds() / 3600.0
-                delta_liters = burn_hours * self.lph_run
-                delta_energy_kwh = delta_liters * self.kwh_per_liter
-                self._burn_last_ok = now
-
-            # Reset
-            self._burn_active = False
-            self._burn_start_time = None
+        if bridged is not None:
+            data["delta_liters"] += bridged["delta_liters"]
+            data["delta_energy_kwh"] += bridged["delta_energy_kwh"]
+            if data["cycle_completed"] is None:
+                data["cycle_completed"] = bridged["cycle_completed"]
 
         # --------------------------------------
-        # DURCHFLUSS & THERMISCHE LEISTUNG (ANZEIGE)
+        # KOSTEN (FIFO über die Lieferungen)
         # --------------------------------------
+        delta_cost = 0.0
+        if data["delta_liters"]:
+            delta_cost = self.fuel.consume(data["delta_liters"])
+            self._fuel_store.async_delay_save(self.fuel.as_dict, FUEL_SAVE_DELAY)
 
-        if state_filtered == STATE_BURN:
-            flow_lph = self.lph_run
-
-        elif state_filtered == STATE_PRECH:
-            # symbolischer minimaler Durchfluss
-            flow_lph = self.lph_run * 0.1
-
-        else:
-            flow_lph = 0.0
-
-        # identischer Wert für gefiltert
-        flow_filtered = flow_lph
-
-        # thermische Leistung (kW)
-        thermal_kw = flow_lph * self.kwh_per_liter
+        price = self.fuel.current_price
+        kwh_per_liter = self.engine.kwh_per_liter
+        data["delta_cost"] = delta_cost
+        data["price_per_kwh"] = price / kwh_per_liter if price is not None and kwh_per_liter else None
 
         # --------------------------------------
-        # RETURN
+        # EREIGNISSE
         # --------------------------------------
-        return {
-            "power": power,
-            "state_raw": state_raw,
-            "state_filtered": state_filtered,
-            "burner_running": state_filtered == STATE_BURN,
-
-            # Anzeigen sicherstellen
-            "flow_lph": flow_lph,
-            "flow_filtered": flow_filtered,
-            "thermal_kw": thermal_kw,
-
-            # Verbrauchs-Delta nur am Ende einer Brennphase
-            "delta_liters": delta_liters,
-            "delta_energy_kwh": delta_energy_kwh,
-
-            # Fehler
-            "error_phc": error_phc,
-            "error_absence": error_absence,
-            "error_global": error_global,
-        }
+        self._async_summary_add(now, data)
+        self._async_fire_events(data)
 
+        return data
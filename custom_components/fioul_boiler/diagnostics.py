@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import FioulBoilerCoordinator
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: FioulBoilerCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    data = dict(coordinator.data or {})
+    data.pop("cycle_completed", None)
+
+    return {
+        "entry": {
+            "data": dict(entry.data),
+            "options": dict(entry.options),
+        },
+        "sources": {
+            "weights": coordinator.sources.weights,
+            "power": coordinator.sources.power,
+            "missing": coordinator.sources.missing,
+            "stale_timeout": coordinator.stale_timeout,
+            "gaps": coordinator.gaps,
+        },
+        "data": data,
+        "fuel": {
+            **coordinator.fuel.as_dict(),
+            "liters_remaining": round(coordinator.fuel.liters_remaining, 3),
+        },
+        "shadows": coordinator.shadows.diagnostics() if coordinator.shadows else None,
+    }
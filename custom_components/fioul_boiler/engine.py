@@ -0,0 +1,300 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from .const import (
+    CONF_LPH_RUN,
+    CONF_DEBOUNCE,
+    CONF_KWH_PER_LITER,
+    CONF_FLOW_TABLE,
+    CONF_FLOW_INTERPOLATE,
+    DEFAULT_LPH_RUN,
+    DEFAULT_DEBOUNCE,
+    DEFAULT_KWH_PER_LITER,
+    DEFAULT_THRESHOLDS,
+    STATE_ARRET,
+    STATE_NUIT,
+    STATE_POMPE,
+    STATE_PRECH,
+    STATE_POST,
+    STATE_BURN,
+    STATE_HORS,
+)
+from .flow_model import FlowModel
+
+
+class BoilerEngine:
+    """
+    Pure burner state machine: power samples in, boiler state and deltas out.
+
+    Enthält die komplette Logik des Coordinators (Schwellen, Debounce,
+    PHC, Abwesenheit, Brenner-Phasen) ohne Bezug zu Home Assistant, damit
+    sie auch offline über Recorder-Historie laufen kann.
+    Zeitstempel werden vom Aufrufer geliefert.
+    """
+
+    def __init__(
+        self,
+        thresholds: dict[str, float],
+        debounce: float,
+        lph_run: float,
+        kwh_per_liter: float,
+        flow_model: FlowModel,
+    ) -> None:
+        self.thresholds = thresholds
+        self.debounce = debounce
+        self.lph_run = lph_run
+        self.kwh_per_liter = kwh_per_liter
+        self.flow_model = flow_model
+
+        # Time/state tracking
+        self._last_raw_state: str = STATE_ARRET
+        self._last_raw_state_change: Optional[datetime] = None
+
+        # Debounced state
+        self._state_filtered: Optional[str] = None
+        self._last_state_filtered: str = STATE_ARRET
+        self._last_state_filtered_change: Optional[datetime] = None
+
+        # PHC error tracking
+        self._phc_pending = False
+        self._phc_check_base_time: Optional[datetime] = None
+        self._phc_error = False
+
+        # Last valid Burn
+        self._burn_last_ok: Optional[datetime] = None
+
+        # Echte Burn-Phasen (manueller Zähler-Modus)
+        self._burn_active = False
+        self._burn_start_time: Optional[datetime] = None
+        self._burn_liters = 0.0
+        self._burn_flow = 0.0
+        self._burn_last_tick: Optional[datetime] = None
+        self._burn_preheat_s = 0.0
+        self._last_preheat_s = 0.0
+
+    @classmethod
+    def from_entry_data(cls, data: dict[str, Any], options: dict[str, Any]) -> BoilerEngine:
+        """Build an engine from config entry data and options."""
+        lph_run = options.get(CONF_LPH_RUN, data.get(CONF_LPH_RUN, DEFAULT_LPH_RUN))
+
+        # Threshold overrides
+        thresholds_opt = options.get("thresholds") or {}
+
+        return cls(
+            thresholds={**DEFAULT_THRESHOLDS, **thresholds_opt},
+            debounce=options.get(CONF_DEBOUNCE, data.get(CONF_DEBOUNCE, DEFAULT_DEBOUNCE)),
+            lph_run=lph_run,
+            kwh_per_liter=options.get(CONF_KWH_PER_LITER, DEFAULT_KWH_PER_LITER),
+            # Leistungsbänder → Durchfluss (mehrstufige / modulierende Brenner),
+            # einmalig kompiliert; Optionsänderungen laden den Eintrag neu
+            flow_model=FlowModel(
+                options.get(CONF_FLOW_TABLE),
+                lph_run,
+                options.get(CONF_FLOW_INTERPOLATE, False),
+            ),
+        )
+
+    def shift(self, offset: timedelta) -> None:
+        """Move all internal timestamps by ``offset``, cutting an interval out of the timeline."""
+        for attr in (
+            "_last_raw_state_change",
+            "_last_state_filtered_change",
+            "_phc_check_base_time",
+            "_burn_last_ok",
+            "_burn_start_time",
+            "_burn_last_tick",
+        ):
+            value = getattr(self, attr)
+            if value is not None:
+                setattr(self, attr, value + offset)
+
+    def step(self, now: datetime, power: float) -> dict[str, Any]:
+        """Process one power sample taken at ``now``."""
+        t = self.thresholds
+
+        # --------------------------------------
+        # ROH-ZUSTAND ERMITTELN
+        # --------------------------------------
+        if power < t["arret"]:
+            state_raw = STATE_ARRET
+        elif power < t["nuit"]:
+            state_raw = STATE_NUIT
+        elif power < t["pompe"]:
+            state_raw = STATE_POMPE
+        elif power < t["prechauffage"]:
+            state_raw = STATE_PRECH
+        elif power < t["postcirc"]:
+            state_raw = STATE_POST
+        elif power <= t["burn_max"]:
+            state_raw = STATE_BURN
+        else:
+            state_raw = STATE_HORS
+
+        # Roh-Zustand Tracking
+        if self._last_raw_state_change is None or state_raw != self._last_raw_state:
+            self._last_raw_state = state_raw
+            self._last_raw_state_change = now
+
+        # --------------------------------------
+        # DEBOUNCE-FILTERUNG
+        # --------------------------------------
+        prev_filtered = self._state_filtered or state_raw
+
+        if self._last_raw_state_change is None:
+            state_filtered = state_raw
+        else:
+            elapsed_raw = (now - self._last_raw_state_change).total_seconds()
+            if elapsed_raw >= self.debounce:
+                state_filtered = self._last_raw_state
+            else:
+                state_filtered = prev_filtered
+
+        # Track filtered state change
+        if self._last_state_filtered_change is None:
+            self._last_state_filtered = state_filtered
+            self._last_state_filtered_change = now
+
+        elif state_filtered != self._last_state_filtered:
+            prev_state = self._last_state_filtered
+            prev_duration = (now - self._last_state_filtered_change).total_seconds()
+
+            # PHC: Pré-chauffage lange genug → pending
+            if prev_state == STATE_PRECH and prev_duration >= 15.0:
+                self._phc_pending = True
+                self._phc_check_base_time = now
+                self._phc_error = False
+
+            # Dauer der Vorwärmung direkt vor dem Brenner (Zyklus-Auswertung)
+            self._last_preheat_s = prev_duration if prev_state == STATE_PRECH else 0.0
+
+            self._last_state_filtered = state_filtered
+            self._last_state_filtered_change = now
+
+        # --------------------------------------
+        # PHC EVAL NACH 2 MIN
+        # --------------------------------------
+        if self._phc_pending and self._phc_check_base_time:
+            check_time = self._phc_check_base_time + timedelta(minutes=2)
+            if now >= check_time:
+                if state_filtered == STATE_BURN and self._last_state_filtered_change:
+                    burn_duration = (now - self._last_state_filtered_change).total_seconds()
+                    if burn_duration >= 20.0:
+                        self._phc_error = False
+                        self._burn_last_ok = now
+                    else:
+                        self._phc_error = True
+                else:
+                    self._phc_error = True
+
+                self._phc_pending = False
+                self._phc_check_base_time = None
+
+        # --------------------------------------
+        # >1H ABSENCE-LOGIK
+        # --------------------------------------
+        if state_filtered in (STATE_ARRET, STATE_NUIT):
+            error_absence = False
+        else:
+            if self._burn_last_ok is None:
+                error_absence = True
+            else:
+                error_absence = (now - self._burn_last_ok) > timedelta(hours=1)
+
+        error_phc = self._phc_error
+        error_global = error_phc or error_absence
+
+        # --------------------------------------
+        # KLASSISCHE BRENNER-PHASEN-LOGIK
+        # --------------------------------------
+        delta_liters = 0.0
+        delta_energy_kwh = 0.0
+        cycle_completed: Optional[dict[str, Any]] = None
+
+        # 1. Start einer Burn-Phase
+        if state_filtered == STATE_BURN and not self._burn_active:
+            self._burn_active = True
+            self._burn_start_time = now
+            self._burn_liters = 0.0
+            self._burn_last_tick = now
+            self._burn_preheat_s = self._last_preheat_s
+
+        # Während der Burn-Phase: Durchfluss des letzten Ticks über das
+        # Intervall integrieren (sample-and-hold der Leistung)
+        elif self._burn_active and self._burn_last_tick:
+            tick_hours = (now - self._burn_last_tick).total_seconds() / 3600.0
+            self._burn_liters += self._burn_flow * tick_hours
+            self._burn_last_tick = now
+
+        # 2. Ende einer Burn-Phase → Verbrauch buchen
+        if self._burn_active and state_filtered != STATE_BURN:
+            if self._burn_start_time:
+                delta_liters = self._burn_liters
+                delta_energy_kwh = delta_liters * self.kwh_per_liter
+                self._burn_last_ok = now
+                cycle_completed = {
+                    "start": self._burn_start_time,
+                    "end": now,
+                    "duration_s": (now - self._burn_start_time).total_seconds(),
+                    "preheat_s": self._burn_preheat_s,
+                    "liters": delta_liters,
+                    "energy_kwh": delta_energy_kwh,
+                }
+
+            # Reset
+            self._burn_active = False
+            self._burn_start_time = None
+            self._burn_liters = 0.0
+            self._burn_last_tick = None
+
+        # --------------------------------------
+        # DURCHFLUSS & THERMISCHE LEISTUNG (ANZEIGE)
+        # --------------------------------------
+
+        if state_filtered == STATE_BURN:
+            flow_lph = self.flow_model.flow(power)
+
+        elif state_filtered == STATE_PRECH:
+            # symbolischer minimaler Durchfluss
+            flow_lph = self.lph_run * 0.1
+
+        else:
+            flow_lph = 0.0
+
+        # Durchfluss gilt bis zum nächsten Tick
+        self._burn_flow = flow_lph if self._burn_active else 0.0
+
+        # identischer Wert für gefiltert
+        flow_filtered = flow_lph
+
+        # thermische Leistung (kW)
+        thermal_kw = flow_lph * self.kwh_per_liter
+
+        self._state_filtered = state_filtered
+
+        # --------------------------------------
+        # RETURN
+        # --------------------------------------
+        return {
+            "power": power,
+            "state_raw": state_raw,
+            "state_filtered": state_filtered,
+            "burner_running": state_filtered == STATE_BURN,
+
+            # Anzeigen sicherstellen
+            "flow_lph": flow_lph,
+            "flow_filtered": flow_filtered,
+            "thermal_kw": thermal_kw,
+
+            # Verbrauchs-Delta nur am Ende einer Brennphase
+            "delta_liters": delta_liters,
+            "delta_energy_kwh": delta_energy_kwh,
+            "cycle_completed": cycle_completed,
+
+            # Fehler
+            "error_phc": error_phc,
+            "error_absence": error_absence,
+            "error_global": error_global,
+        }
+
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from typing import Any, NamedTuple, Optional
+
+from homeassistant.const import STATE_UNKNOWN, STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import restore_state
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import CONF_OPTIONAL_ENTITIES, DEFAULT_OPTIONAL_ENTITIES
+from .coordinator import FioulBoilerCoordinator
+from .history import async_resolve_entity_ids
+
+
+class FioulBoilerEntity(CoordinatorEntity[FioulBoilerCoordinator]):
+    """
+    Base entity driven by a description tuple.
+
+    Schlüssel, Unique-ID und Übersetzung kommen aus ``description.key``;
+    ``device_info`` ist ein einziges Objekt pro Eintrag (am Coordinator),
+    nicht ein neues Dict pro Entität und Zugriff.
+    """
+
+    _attr_has_entity_name = True
+
+    def __init__(self, coordinator: FioulBoilerCoordinator, description: NamedTuple) -> None:
+        super().__init__(coordinator)
+        self.description = description
+        self._attr_translation_key = description.key
+        self._attr_unique_id = f"{coordinator.entry.entry_id}_{description.key}"
+        self._attr_device_info = coordinator.device_info
+
+
+def enabled_descriptions(coordinator: FioulBoilerCoordinator, descriptions: tuple) -> list:
+    """Descriptions to create: all mandatory ones plus the opted-in optional groups."""
+    opts = coordinator.entry.options or {}
+    enabled = set(opts.get(CONF_OPTIONAL_ENTITIES, DEFAULT_OPTIONAL_ENTITIES))
+    return [d for d in descriptions if d.optional is None or d.optional in enabled]
+
+
+@callback
+def async_restore_values(
+    hass: HomeAssistant, entry_id: str, platform: str, keys: list[str]
+) -> dict[str, Optional[float]]:
+    """
+    Look up the last stored numeric state of several entities at once.
+
+    Ein Registry-Lookup pro Schlüssel gegen die bereits geladenen
+    Restore-Daten, statt einer eigenen Abfrage je Entität beim Hinzufügen.
+    Unbekannte, fehlende oder nicht-numerische Zustände ergeben ``None``.
+    """
+    last_states = restore_state.async_get(hass).last_states
+    entity_ids = async_resolve_entity_ids(hass, entry_id, platform, keys)
+
+    values: dict[str, Optional[float]] = dict.fromkeys(keys)
+    for key, entity_id in entity_ids.items():
+        stored: Any = last_states.get(entity_id)
+        if stored is None or stored.state.state in (STATE_UNKNOWN, STATE_UNAVAILABLE):
+            continue
+        try:
+            values[key] = float(stored.state.state)
+        except ValueError:
+            continue
+    return values
@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import csv
+from datetime import date, datetime, timedelta
+from typing import Any, Optional
+import logging
+import os
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import STATE_BURN, STATE_KEYS
+from .history import async_resolve_entity_ids, fetch_state_changes, iter_local_days
+from .recompute import CorrectionLedger
+
+_LOGGER = logging.getLogger(__name__)
+
+CYCLE_COLUMNS = ["start", "end", "duration_s", "liters", "energy_kwh"]
+# Zeilen pro Parquet-Row-Group (begrenzt den Speicher, vermeidet Mini-Row-Groups)
+PARQUET_BATCH_ROWS = 10_000
+
+# Zählerspalte → Schlüssel im Korrektur-Ledger der Nachberechnung
+LEDGER_KEYS = {"liters": "delta_liters", "energy_kwh": "delta_energy_kwh"}
+# Ein Zählersprung gilt als Korrektur, wenn er so nah an einer Buchung liegt
+CORRECTION_MATCH = timedelta(seconds=60)
+CORRECTION_TOLERANCE = 1e-3
+
+DAILY_COLUMNS = ["date", "liters", "energy_kwh", "burn_cycles"] + [
+    f"{key}_s" for key in STATE_KEYS.values()
+]
+
+
+class _CsvWriter:
+    def __init__(self, path: str, columns: list[str]) -> None:
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._file, fieldnames=columns)
+        self._writer.writeheader()
+
+    def write(self, rows: list[dict[str, Any]]) -> None:
+        self._writer.writerows(rows)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _ParquetWriter:
+    """Buffers rows and writes one row group per ``PARQUET_BATCH_ROWS`` rows."""
+
+    def __init__(self, path: str, columns: list[str]) -> None:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as err:
+            raise HomeAssistantError("Parquet export requires the 'pyarrow' package") from err
+
+        types = {"start": pa.string(), "end": pa.string(), "date": pa.string(), "burn_cycles": pa.int64()}
+        self._pa = pa
+        self._schema = pa.schema([(col, types.get(col, pa.float64())) for col in columns])
+        self._writer = pq.ParquetWriter(path, self._schema)
+        self._rows: list[dict[str, Any]] = []
+
+    def write(self, rows: list[dict[str, Any]]) -> None:
+        self._rows.extend(rows)
+        if len(self._rows) >= PARQUET_BATCH_ROWS:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._rows:
+            self._writer.write_table(self._pa.Table.from_pylist(self._rows, schema=self._schema))
+            self._rows = []
+
+    def close(self) -> None:
+        try:
+            self._flush()
+        finally:
+            self._writer.close()
+
+
+_WRITERS = {"csv": _CsvWriter, "parquet": _ParquetWriter}
+
+
+class BurnHistoryReducer:
+    """
+    Rebuild burn cycles and daily aggregates from recorded entity states.
+
+    Eingang ist der zeitlich sortierte Strom aus Kesselzustand und den
+    Gesamtzählern (Liter, kWh). Ein Zyklus ist eine zusammenhängende
+    ``Brûleur en marche``-Phase; seine Liter/kWh sind die Zählersprünge,
+    die der Coordinator am Zyklusende bucht.
+    Der Zustand wird über Chunk-Grenzen hinweg mitgeführt.
+
+    Mit ``ledger`` zählen die Sprünge einer Nachberechnung weder zum
+    Buchungstag noch zu einem Zyklus; die Korrekturen landen stattdessen
+    auf ihren Zieltagen. Zyklen bleiben so, wie sie aufgezeichnet wurden.
+    """
+
+    def __init__(
+        self,
+        state_entity: str,
+        liters_entity: str,
+        energy_entity: str,
+        ledger: Optional[CorrectionLedger] = None,
+    ) -> None:
+        self._state_entity = state_entity
+        self._counter_keys = {liters_entity: "liters", energy_entity: "energy_kwh"}
+        self._counters: dict[str, Optional[float]] = {"liters": None, "energy_kwh": None}
+
+        self._jumps: dict[str, list[tuple[datetime, float]]] = {
+            key: list(ledger.jumps[ledger_key]) if ledger else []
+            for key, ledger_key in LEDGER_KEYS.items()
+        }
+        self._applied: dict[str, dict[date, float]] = {
+            key: ledger.applied[ledger_key] if ledger else {}
+            for key, ledger_key in LEDGER_KEYS.items()
+        }
+
+        self._state: Optional[str] = None
+        self._state_since: Optional[datetime] = None
+        self._cycle_start: Optional[datetime] = None
+        self._pending_cycle: Optional[dict[str, Any]] = None
+
+        self.cycles: list[dict[str, Any]] = []
+        self._date: Optional[date] = None
+        self._day: dict[str, Any] = {}
+
+    def start_day(self, day: date, start: datetime) -> None:
+        self._date = day
+        self._day = {col: 0.0 for col in DAILY_COLUMNS}
+        self._day["date"] = day.isoformat()
+        self._day["burn_cycles"] = 0
+        if self._state is not None:
+            self._state_since = start
+
+    def feed(self, when: datetime, entity_id: str, state: str) -> None:
+        if state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            return
+
+        if entity_id == self._state_entity:
+            self._on_state(when, state)
+            return
+
+        key = self._counter_keys[entity_id]
+        try:
+            value = float(state)
+        except ValueError:
+            return
+        previous = self._counters[key]
+        self._counters[key] = value
+        if previous is None or value <= previous:
+            return
+
+        increment = value - previous
+        if self._is_correction(key, when, increment):
+            return
+        self._day[key] += increment
+        if self._pending_cycle is not None:
+            self._pending_cycle[key] += increment
+            if self._pending_cycle["liters"] and self._pending_cycle["energy_kwh"]:
+                self._flush_cycle()
+
+    def _is_correction(self, key: str, when: datetime, increment: float) -> bool:
+        jumps = self._jumps[key]
+        for index, (booked_at, value) in enumerate(jumps):
+            if (
+                abs(when - booked_at) <= CORRECTION_MATCH
+                and abs(increment - value) <= CORRECTION_TOLERANCE
+            ):
+                del jumps[index]
+                return True
+        return False
+
+    def _on_state(self, when: datetime, state: str) -> None:
+        if state == self._state:
+            return
+        self._account(when)
+
+        if state == STATE_BURN:
+            self._flush_cycle()
+            self._cycle_start = when
+        elif self._state == STATE_BURN and self._cycle_start is not None:
+            self._pending_cycle = {
+                "start": self._cycle_start.isoformat(),
+                "end": when.isoformat(),
+                "duration_s": round((when - self._cycle_start).total_seconds(), 1),
+                "liters": 0.0,
+                "energy_kwh": 0.0,
+            }
+            self._day["burn_cycles"] += 1
+            self._cycle_start = None
+
+        self._state = state
+
+    def _account(self, until: datetime) -> None:
+        if self._state is not None and self._state_since is not None:
+            key = STATE_KEYS.get(self._state)
+            if key is not None:
+                self._day[f"{key}_s"] += (until - self._state_since).total_seconds()
+        self._state_since = until
+
+    def _flush_cycle(self) -> None:
+        if self._pending_cycle is not None:
+            self.cycles.append(self._pending_cycle)
+            self._pending_cycle = None
+
+    def end_day(self, end: datetime) -> dict[str, Any]:
+        self._account(end)
+        row = self._day
+        for key, applied in self._applied.items():
+            row[key] += applied.get(self._date, 0.0)
+        for col in DAILY_COLUMNS[1:]:
+            if col != "burn_cycles":
+                row[col] = round(row[col], 4)
+        return row
+
+    def finish(self) -> None:
+        self._flush_cycle()
+
+
+def _export_sync(
+    hass: HomeAssistant,
+    entity_ids: dict[str, str],
+    start: date,
+    end: date,
+    fmt: str,
+    base_path: str,
+    ledger: CorrectionLedger,
+) -> list[str]:
+    """Stream the export chunk by chunk. Runs in the recorder executor."""
+    reducer = BurnHistoryReducer(
+        entity_ids["state"],
+        entity_ids["liters_total"],
+        entity_ids["energy_total_kwh"],
+        ledger,
+    )
+    watched = list(entity_ids.values())
+
+    os.makedirs(os.path.dirname(base_path), exist_ok=True)
+    paths = [f"{base_path}_cycles.{fmt}", f"{base_path}_daily.{fmt}"]
+    writer_cls = _WRITERS[fmt]
+    cycles_out = writer_cls(paths[0], CYCLE_COLUMNS)
+    daily_out = writer_cls(paths[1], DAILY_COLUMNS)
+
+    try:
+        # Ein Tag pro Recorder-Abfrage und Schreibvorgang
+        for day, chunk_start, chunk_end in iter_local_days(start, end):
+            reducer.start_day(day, chunk_start)
+            for when, entity_id, state in fetch_state_changes(hass, chunk_start, chunk_end, watched):
+                reducer.feed(when, entity_id, state)
+
+            daily_out.write([reducer.end_day(chunk_end)])
+            cycles_out.write(reducer.cycles)
+            reducer.cycles = []
+
+        reducer.finish()
+        cycles_out.write(reducer.cycles)
+    finally:
+        cycles_out.close()
+        daily_out.close()
+
+    return paths
+
+
+async def async_export(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    start: date,
+    end: date,
+    fmt: str,
+    filename: str,
+) -> list[str]:
+    """Export burn cycles and daily aggregates of one boiler below ``/config``."""
+    if end < start:
+        raise HomeAssistantError("End date must not be before start date")
+
+    config_dir = os.path.realpath(hass.config.path())
+    base_path = os.path.realpath(hass.config.path(filename))
+    if os.path.commonpath([config_dir, base_path]) != config_dir:
+        raise HomeAssistantError(f"Export path must be inside {config_dir}")
+
+    entity_ids = async_resolve_entity_ids(
+        hass, entry.entry_id, "sensor", ["state", "liters_total", "energy_total_kwh"]
+    )
+    if len(entity_ids) != 3:
+        raise HomeAssistantError("Boiler state or total sensors are not registered")
+
+    base_path, _ = os.path.splitext(base_path)
+
+    # Korrekturen der Nachberechnung auf ihre Zieltage verteilen
+    ledger = CorrectionLedger(hass, entry.entry_id)
+    await ledger.async_load()
+
+    paths = await get_instance(hass).async_add_executor_job(
+        _export_sync, hass, entity_ids, start, end, fmt, base_path, ledger
+    )
+    _LOGGER.info("Exported %s to %s", entry.title, ", ".join(paths))
+    return paths
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+
+
+def parse_flow_table(text: str) -> list[list[float]]:
+    """
+    Parse ``"W:L/h, W:L/h, ..."`` into sorted ``[[power_w, lph], ...]`` points.
+
+    Example for a two-stage burner: ``"200:1.4, 320:2.6"``.
+    An empty string yields an empty table (single-stage burner).
+    Raises ValueError on malformed input.
+    """
+    points: dict[float, float] = {}
+    for chunk in text.replace(";", ",").split(","):
+        chunk = chunk.strip()
+        if not chunk:
+            continue
+        power, sep, lph = chunk.partition(":")
+        if not sep:
+            raise ValueError(f"Missing ':' in flow table entry {chunk!r}")
+        power_w = float(power)
+        flow = float(lph)
+        if power_w < 0 or flow < 0:
+            raise ValueError(f"Negative value in flow table entry {chunk!r}")
+        points[power_w] = flow
+
+    return [[power_w, points[power_w]] for power_w in sorted(points)]
+
+
+def format_flow_table(table: list[list[float]]) -> str:
+    """Inverse of :func:`parse_flow_table`, used as options form default."""
+    return ", ".join(f"{power_w:g}:{lph:g}" for power_w, lph in table)
+
+
+class FlowModel:
+    """
+    Map electrical power to fuel flow (L/h) during the burn phase.
+
+    Ohne Tabelle: konstanter Durchfluss ``lph_run`` (einstufiger Brenner).
+    Mit Tabelle: jede Stützstelle ``(W, L/h)`` eröffnet ein Leistungsband,
+    das bis zur nächsten Stützstelle gilt; optional wird linear zwischen
+    den Stützstellen interpoliert. Außerhalb der Tabelle wird auf den
+    ersten bzw. letzten Wert begrenzt.
+
+    Die Tabelle wird einmalig beim Laden der Optionen kompiliert; die
+    Abfrage pro Tick ist eine binäre Suche.
+    """
+
+    __slots__ = ("_powers", "_flows", "_interpolate", "_constant")
+
+    def __init__(
+        self,
+        table: list[list[float]] | None,
+        lph_run: float,
+        interpolate: bool = False,
+    ) -> None:
+        points = sorted((float(p), float(f)) for p, f in (table or []))
+        self._powers: tuple[float, ...] = tuple(p for p, _ in points)
+        self._flows: tuple[float, ...] = tuple(f for _, f in points)
+        self._interpolate = interpolate and len(points) > 1
+        self._constant: float | None = None if points else float(lph_run)
+
+    def flow(self, power: float) -> float:
+        """Fuel flow in L/h for an electrical power in W."""
+        if self._constant is not None:
+            return self._constant
+
+        powers = self._powers
+        flows = self._flows
+        idx = bisect_right(powers, power)
+
+        if idx == 0:
+            return flows[0]
+        if idx == len(powers) or not self._interpolate:
+            return flows[idx - 1]
+
+        p0 = powers[idx - 1]
+        p1 = powers[idx]
+        f0 = flows[idx - 1]
+        return f0 + (flows[idx] - f0) * (power - p0) / (p1 - p0)
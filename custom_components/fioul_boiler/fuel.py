@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Optional
+
+
+class FuelLedger:
+    """
+    Oil deliveries ("lots") consumed first-in-first-out.
+
+    Jede Lieferung ist ``[liter_rest, preis_pro_liter, lieferdatum]``.
+    ``consume`` verbraucht vom ältesten Los und gibt die Kosten zurück;
+    leere Lose werden vorne entfernt. Pro Brennzyklus ist der Aufwand
+    konstant (amortisiert), unabhängig von der Verbrauchshistorie.
+
+    Ist der Tank laut Buchführung leer, wird zum zuletzt bekannten Preis
+    weitergerechnet und die Menge in ``unpriced_liters`` gezählt.
+
+    Die Reihenfolge ist das Lieferdatum, nicht die Reihenfolge der Eingabe:
+    eine nachträglich erfasste ältere Lieferung wird als Nächstes verbraucht.
+    Bereits gebuchter Verbrauch wird dabei nicht neu bewertet.
+    """
+
+    def __init__(self) -> None:
+        self._lots: deque[list[Any]] = deque()
+        self.last_price: Optional[float] = None
+        self.unpriced_liters = 0.0
+
+    @property
+    def current_price(self) -> Optional[float]:
+        """Price per liter of the lot currently being burned."""
+        if self._lots:
+            return self._lots[0][1]
+        return self.last_price
+
+    @property
+    def liters_remaining(self) -> float:
+        """Liters left in all lots according to the bookkeeping."""
+        return sum(lot[0] for lot in self._lots)
+
+    def add_lot(self, liters: float, price_per_liter: float, delivered: str) -> None:
+        """Insert a lot by delivery date (ISO string), after lots of the same day."""
+        lots = self._lots
+        index = len(lots)
+        while index > 0 and lots[index - 1][2] > delivered:
+            index -= 1
+        lots.insert(index, [float(liters), float(price_per_liter), delivered])
+
+    def consume(self, liters: float) -> float:
+        """Book ``liters`` against the oldest lots; returns their cost."""
+        cost = 0.0
+        lots = self._lots
+
+        while liters > 0 and lots:
+            lot = lots[0]
+            used = min(lot[0], liters)
+            cost += used * lot[1]
+            lot[0] -= used
+            liters -= used
+            self.last_price = lot[1]
+            if lot[0] <= 1e-9:
+                lots.popleft()
+
+        if liters > 0:
+            self.unpriced_liters += liters
+            if self.last_price is not None:
+                cost += liters * self.last_price
+
+        return cost
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "lots": [list(lot) for lot in self._lots],
+            "last_price": self.last_price,
+            "unpriced_liters": self.unpriced_liters,
+        }
+
+    def load(self, data: dict[str, Any]) -> None:
+        self._lots = deque(list(lot) for lot in data.get("lots", []))
+        self.last_price = data.get("last_price")
+        self.unpriced_liters = data.get("unpriced_liters", 0.0)
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from heapq import merge
+from typing import Iterator
+
+from homeassistant.components.recorder import history
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+
+@callback
+def async_resolve_entity_ids(
+    hass: HomeAssistant, entry_id: str, platform: str, keys: list[str]
+) -> dict[str, str]:
+    """Map translation keys of our entities to their current entity ids."""
+    registry = er.async_get(hass)
+    entity_ids: dict[str, str] = {}
+    for key in keys:
+        entity_id = registry.async_get_entity_id(platform, DOMAIN, f"{entry_id}_{key}")
+        if entity_id is not None:
+            entity_ids[key] = entity_id
+    return entity_ids
+
+
+def iter_local_days(start: date, end: date) -> Iterator[tuple[date, datetime, datetime]]:
+    """Yield ``(day, day_start, next_day_start)`` for every local day in ``start..end``."""
+    day = start
+    while day <= end:
+        next_day = day + timedelta(days=1)
+        yield day, dt_util.start_of_local_day(day), dt_util.start_of_local_day(next_day)
+        day = next_day
+
+
+def fetch_state_changes(
+    hass: HomeAssistant,
+    start: datetime,
+    end: datetime,
+    entity_ids: list[str],
+) -> Iterator[tuple[datetime, str, str]]:
+    """
+    Recorder state changes of several entities as one time-ordered stream.
+
+    Yields ``(time, entity_id, state)``. The state valid at ``start`` is
+    included for every entity. Must run in the recorder executor.
+    """
+    states = history.get_significant_states(
+        hass,
+        start,
+        end,
+        entity_ids,
+        include_start_time_state=True,
+        significant_changes_only=False,
+        no_attributes=True,
+    )
+    streams = [
+        ((max(state.last_changed, start), entity_id, state.state) for state in entity_states)
+        for entity_id, entity_states in states.items()
+    ]
+    return merge(*streams, key=lambda item: item[0])
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Optional
+
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, State, callback
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .const import (
+    CONF_POWER_SENSOR,
+    CONF_POWER_SENSORS,
+    CONF_SOURCE_WEIGHTS,
+    DEFAULT_SOURCE_WEIGHT,
+)
+
+
+def get_source_weights(data: dict[str, Any]) -> dict[str, float]:
+    """Return ``{entity_id: weight}`` for a config entry's data.
+
+    Entries created before multi-source support only carry a single
+    ``power_sensor`` entity; it is mapped to weight 1.0.
+    """
+    entity_ids = data.get(CONF_POWER_SENSORS)
+    if not entity_ids:
+        entity_ids = [data[CONF_POWER_SENSOR]]
+
+    weights = data.get(CONF_SOURCE_WEIGHTS) or {}
+    return {
+        entity_id: float(weights.get(entity_id, DEFAULT_SOURCE_WEIGHT))
+        for entity_id in entity_ids
+    }
+
+
+class PowerSourceFusion:
+    """
+    Fuse one or more power sensors into a single power sample stream.
+
+    Die Quellen werden per State-Change-Event abonniert, nicht pro Tick
+    abgefragt: jede Quelle hält ihren letzten Wert (sample-and-hold) und
+    die gewichtete Summe wird nur bei einer Änderung neu gebildet.
+    Der Coordinator liest pro Tick lediglich ``power``.
+
+    Zeitabgleich: Quellen melden asynchron; es gibt keine Interpolation
+    zwischen ihren Zeitstempeln. Der Coordinator tastet die gehaltenen
+    Werte in seinem eigenen 1-Hz-Takt ab (sample-and-hold), d. h. ein
+    Sample kann Werte verschiedener Quellen enthalten, die bis zu deren
+    Meldeintervall auseinanderliegen. ``last_updated`` je Quelle dient nur
+    der Erkennung veralteter Quellen (``in_gap``).
+
+    Lücken: ``unavailable``/``unknown`` und nicht-numerische Werte werden
+    nicht als 0 W gelesen; die Quelle behält ihren letzten gültigen Wert
+    und gilt als fehlend (``missing``), bis wieder ein Zahlenwert kommt.
+    """
+
+    def __init__(self, hass: HomeAssistant, weights: dict[str, float]) -> None:
+        self.hass = hass
+        self.weights = weights
+        self.entity_ids: list[str] = list(weights)
+
+        self._values: dict[str, float] = {entity_id: 0.0 for entity_id in weights}
+        self._updated: dict[str, Optional[datetime]] = dict.fromkeys(weights)
+        self.missing: dict[str, str] = {}
+
+        self.power: float = 0.0
+
+    def in_gap(self, now: datetime, stale_timeout: float) -> bool:
+        """True if a source is missing or its last update is older than ``stale_timeout`` s."""
+        if self.missing:
+            return True
+        if stale_timeout <= 0:
+            return False
+        for updated in self._updated.values():
+            if updated is None or (now - updated).total_seconds() > stale_timeout:
+                return True
+        return False
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Read the current source states and subscribe to their changes."""
+        for entity_id in self.entity_ids:
+            self._set_state_obj(entity_id, self.hass.states.get(entity_id))
+
+        return async_track_state_change_event(
+            self.hass, self.entity_ids, self._async_source_changed
+        )
+
+    @callback
+    def _async_source_changed(self, event: Event) -> None:
+        self._set_state_obj(event.data["entity_id"], event.data.get("new_state"))
+
+    def _set_state_obj(self, entity_id: str, state_obj: Optional[State]) -> None:
+        if state_obj is None:
+            self.set_state(entity_id, None, None)
+        else:
+            self.set_state(entity_id, state_obj.state, state_obj.last_updated)
+
+    def set_state(self, entity_id: str, state: Optional[str], when: Optional[datetime]) -> None:
+        """Feed one raw source state; also used to replay recorder history."""
+        if when is not None:
+            self._updated[entity_id] = when
+
+        if state is None or state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            self.missing[entity_id] = state or STATE_UNKNOWN
+            return
+        try:
+            value = float(state)
+        except ValueError:
+            self.missing[entity_id] = state
+            return
+        self.missing.pop(entity_id, None)
+
+        if self._values[entity_id] != value:
+            self._values[entity_id] = value
+            weights = self.weights
+            self.power = sum(v * weights[eid] for eid, v in self._values.items())
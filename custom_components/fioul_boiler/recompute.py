@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from typing import Any
+import logging
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.statistics import async_adjust_statistics
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, CORRECTIONS_STORAGE_VERSION
+from .coordinator import FioulBoilerCoordinator
+from .engine import BoilerEngine
+from .history import async_resolve_entity_ids, fetch_state_changes, iter_local_days
+from .power_source import PowerSourceFusion
+
+_LOGGER = logging.getLogger(__name__)
+
+# Vorlauf vor dem Bereich, damit Debounce und laufende Phasen eingeschwungen sind
+RECOMPUTE_WARMUP = timedelta(hours=1)
+TICK = timedelta(seconds=1)
+
+# Gesamtzähler → Delta-Schlüssel des Coordinators
+COUNTERS = {
+    "liters_total": "delta_liters",
+    "energy_total_kwh": "delta_energy_kwh",
+}
+
+Corrections = dict[str, dict[date, float]]
+
+
+class CorrectionLedger:
+    """
+    Corrections already booked by earlier recomputes, persisted per entry.
+
+    ``applied``: Summe der Korrekturen je Zieltag — ein erneuter Lauf über
+    denselben Bereich bucht nur noch die Differenz zum neuen Ergebnis.
+    ``jumps``: positive Zustandssprünge der Gesamtsensoren mit Zeitpunkt;
+    sie stehen in der Recorder-Historie und sind kein echter Verbrauch.
+    Beides je Delta-Schlüssel (``delta_liters`` / ``delta_energy_kwh``).
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._store: Store[dict[str, Any]] = Store(
+            hass, CORRECTIONS_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.corrections"
+        )
+        self.applied: Corrections = {key: {} for key in COUNTERS.values()}
+        self.jumps: dict[str, list[tuple[datetime, float]]] = {
+            key: [] for key in COUNTERS.values()
+        }
+
+    async def async_load(self) -> None:
+        stored = await self._store.async_load() or {}
+        for key, per_day in stored.get("applied", {}).items():
+            if key in self.applied:
+                self.applied[key] = {
+                    date.fromisoformat(day): value for day, value in per_day.items()
+                }
+        for key, jumps in stored.get("jumps", {}).items():
+            if key in self.jumps:
+                self.jumps[key] = [
+                    (dt_util.parse_datetime(when), value) for when, value in jumps
+                ]
+
+    async def async_save(self) -> None:
+        await self._store.async_save({
+            "applied": {
+                key: {day.isoformat(): value for day, value in per_day.items()}
+                for key, per_day in self.applied.items()
+            },
+            "jumps": {
+                key: [[when.isoformat(), value] for when, value in jumps]
+                for key, jumps in self.jumps.items()
+            },
+        })
+
+    def booked(self) -> Corrections:
+        """Jumps summed per local day they were booked on."""
+        booked: Corrections = {}
+        for key, jumps in self.jumps.items():
+            per_day = booked[key] = {}
+            for when, value in jumps:
+                day = dt_util.as_local(when).date()
+                per_day[day] = per_day.get(day, 0.0) + value
+        return booked
+
+    def settle(self, corrections: Corrections, now: datetime) -> None:
+        """
+        Turn the full per-day differences into the still missing part,
+        in place, and record it as applied and as a jump at ``now``.
+        """
+        for key, per_day in corrections.items():
+            applied = self.applied[key]
+            for day, delta in per_day.items():
+                delta -= applied.get(day, 0.0)
+                per_day[day] = delta
+                applied[day] = applied.get(day, 0.0) + delta
+            # Die Gesamtsensoren springen einmal um die Summe aller Tage
+            total = sum(per_day.values())
+            if total > 0:
+                self.jumps[key].append((now, total))
+
+
+def _recompute_sync(
+    hass: HomeAssistant,
+    engine: BoilerEngine,
+    fusion: PowerSourceFusion,
+    counter_ids: dict[str, str],
+    booked: Corrections,
+    start: date,
+    end: date,
+    until: datetime,
+) -> Corrections:
+    """
+    Replay recorder power history through a fresh engine, one day per query.
+
+    Returns per-day differences between recomputed and recorded deltas,
+    keyed like the coordinator data (``delta_liters`` / ``delta_energy_kwh``).
+    Jumps booked by earlier recomputes (``booked``) are not counted as
+    recorded consumption. Runs in the recorder executor.
+    """
+    counter_keys = {entity_id: COUNTERS[key] for key, entity_id in counter_ids.items()}
+    watched = fusion.entity_ids + list(counter_keys)
+    last_counter: dict[str, float] = {}
+
+    first_start = dt_util.start_of_local_day(start)
+    windows: list[tuple[date | None, datetime, datetime]] = [
+        (None, first_start - RECOMPUTE_WARMUP, first_start)
+    ]
+    windows.extend(iter_local_days(start, end))
+
+    corrections: Corrections = {key: {} for key in COUNTERS.values()}
+
+    for day, window_start, window_end in windows:
+        window_end = min(window_end, until)
+        if window_start >= window_end:
+            break
+
+        recomputed = dict.fromkeys(corrections, 0.0)
+        recorded = dict.fromkeys(corrections, 0.0)
+
+        events = fetch_state_changes(hass, window_start, window_end, watched)
+        pending = next(events, None)
+        tick = window_start
+
+        while tick < window_end:
+            # Alle bis zu diesem Tick aufgezeichneten Änderungen anwenden
+            while pending is not None and pending[0] <= tick:
+                when, entity_id, state = pending
+                key = counter_keys.get(entity_id)
+                if key is None:
+                    fusion.set_state(entity_id, state, when)
+                else:
+                    try:
+                        value = float(state)
+                    except ValueError:
+                        value = None
+                    if value is not None:
+                        previous = last_counter.get(entity_id)
+                        if previous is not None and value > previous:
+                            recorded[key] += value - previous
+                        last_counter[entity_id] = value
+                pending = next(events, None)
+
+            result = engine.step(tick, fusion.power)
+            for key in recomputed:
+                recomputed[key] += result[key]
+            tick += TICK
+
+        if day is not None:
+            for key, per_day in corrections.items():
+                original = recorded[key] - booked[key].get(day, 0.0)
+                per_day[day] = recomputed[key] - original
+
+    return corrections
+
+
+@callback
+def _async_apply_corrections(
+    hass: HomeAssistant,
+    coordinator: FioulBoilerCoordinator,
+    corrections: Corrections,
+) -> None:
+    """
+    Apply all corrections in one event-loop step (no awaits in between).
+
+    Jeder Liter-/kWh-Zähler (gesamt und Periode) übernimmt den Anteil
+    seiner laufenden Periode sofort als Zustandssprung. In seiner
+    Langzeitstatistik wird jede Tageskorrektur ab dem jeweiligen
+    Tagesende gebucht; da der Zustandssprung erneut in die Summe
+    einfließt, wird dieser Anteil ab den letzten Kurzzeit-Statistiken
+    wieder zurückgenommen. Tage, deren Ende nach diesem Zeitpunkt liegt
+    (heute), fehlen in beiden Buchungen: für sie genügt der Zustandssprung.
+    Die Sensoren sind TOTAL, negative Sprünge
+    gelten daher nicht als Zählerreset.
+    """
+    compensate_from = dt_util.utcnow() - timedelta(minutes=10)
+
+    for sensor in list(coordinator.accumulators):
+        per_day = corrections.get(sensor.correction_key)
+        if not per_day:
+            continue
+        jumped = sensor.async_apply_correction(corrections)
+        unit = sensor.native_unit_of_measurement
+
+        compensation = 0.0
+        for day, delta in per_day.items():
+            if abs(delta) < 1e-6:
+                continue
+            day_end = dt_util.start_of_local_day(day + timedelta(days=1))
+            if day_end > compensate_from:
+                # Laufender Tag: noch keine Statistikzeilen; der Zustandssprung
+                # bucht ihn bereits zur aktuellen Zeit
+                continue
+            async_adjust_statistics(hass, sensor.entity_id, day_end, delta, unit)
+            if day in jumped:
+                compensation += delta
+        if compensation:
+            async_adjust_statistics(hass, sensor.entity_id, compensate_from, -compensation, unit)
+
+
+async def async_recompute(
+    hass: HomeAssistant,
+    coordinator: FioulBoilerCoordinator,
+    start: date,
+    end: date,
+) -> dict[str, Any]:
+    """Recompute consumption for ``start..end`` with the current options."""
+    if end < start:
+        raise HomeAssistantError("End date must not be before start date")
+    if coordinator.recompute_running:
+        raise HomeAssistantError("A recompute is already running for this boiler")
+
+    entry = coordinator.entry
+    counter_ids = async_resolve_entity_ids(hass, entry.entry_id, "sensor", list(COUNTERS))
+    if len(counter_ids) != len(COUNTERS):
+        raise HomeAssistantError("Boiler total sensors are not registered")
+
+    engine = BoilerEngine.from_entry_data(entry.data, entry.options or {})
+    fusion = PowerSourceFusion(hass, coordinator.sources.weights)
+
+    coordinator.recompute_running = True
+    try:
+        ledger = CorrectionLedger(hass, entry.entry_id)
+        await ledger.async_load()
+        corrections = await get_instance(hass).async_add_executor_job(
+            _recompute_sync,
+            hass,
+            engine,
+            fusion,
+            counter_ids,
+            ledger.booked(),
+            start,
+            end,
+            dt_util.utcnow(),
+        )
+
+        # Nur den noch fehlenden Teil buchen; Ledger vor den Sensoren sichern
+        ledger.settle(corrections, dt_util.utcnow())
+        await ledger.async_save()
+    finally:
+        coordinator.recompute_running = False
+
+    _async_apply_corrections(hass, coordinator, corrections)
+
+    summary = {key: round(sum(per_day.values()), 4) for key, per_day in corrections.items()}
+    _LOGGER.info(
+        "Recomputed %s from %s to %s: %s", entry.title, start, end, summary
+    )
+    return summary
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Any
+from datetime import date, datetime
+from time import monotonic
+from typing import NamedTuple, Optional
 
 from homeassistant.components.sensor import (
     SensorEntity,
@@ -10,397 +11,340 @@ from homeassistant.components.sensor import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.const import STATE_UNKNOWN, STATE_UNAVAILABLE
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.util import dt as dt_util
 
 from .const import DOMAIN
 from .coordinator import FioulBoilerCoordinator
+from .entity import FioulBoilerEntity, async_restore_values, enabled_descriptions
+from .window import WindowStats
+
+# Platzhalter in ``unit``, beim Anlegen durch die Währung der Instanz ersetzt
+CURRENCY = "{currency}"
+
+# Perioden der Zähler → Anzahl der Datumsfelder (Jahr, Monat, Tag), die gleich bleiben
+PERIOD_FIELDS: dict[Optional[str], int] = {None: 0, "year": 1, "month": 2, "day": 3}
+
+KIND_VALUE = "value"
+KIND_MEASUREMENT = "measurement"
+KIND_ACCUMULATOR = "accumulator"
+
+
+class FioulBoilerSensorDescription(NamedTuple):
+    """One row of the sensor table (immutable, no per-instance ``__dict__``)."""
+
+    key: str
+    kind: str
+    data_key: str
+    device_class: Optional[SensorDeviceClass] = None
+    state_class: Optional[SensorStateClass] = None
+    unit: Optional[str] = None
+    digits: Optional[int] = None
+    # Zähler: None = gesamt, sonst "day" / "month" / "year"
+    period: Optional[str] = None
+    # Gruppe in ``optional_entities``; None = immer angelegt
+    optional: Optional[str] = None
+
+
+def _liters(key: str, period: Optional[str]) -> FioulBoilerSensorDescription:
+    return FioulBoilerSensorDescription(
+        key, KIND_ACCUMULATOR, "delta_liters",
+        state_class=SensorStateClass.TOTAL, unit="L", digits=3, period=period,
+    )
+
+
+def _energy(key: str, period: Optional[str]) -> FioulBoilerSensorDescription:
+    return FioulBoilerSensorDescription(
+        key, KIND_ACCUMULATOR, "delta_energy_kwh",
+        device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL,
+        unit="kWh", digits=4, period=period,
+    )
+
+
+def _cost(key: str, period: str) -> FioulBoilerSensorDescription:
+    return FioulBoilerSensorDescription(
+        key, KIND_ACCUMULATOR, "delta_cost",
+        device_class=SensorDeviceClass.MONETARY, state_class=SensorStateClass.TOTAL,
+        unit=CURRENCY, digits=2, period=period, optional="cost",
+    )
+
+
+SENSORS: tuple[FioulBoilerSensorDescription, ...] = (
+    FioulBoilerSensorDescription("state", KIND_VALUE, "state_filtered"),
+    FioulBoilerSensorDescription(
+        "power", KIND_MEASUREMENT, "power",
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT, unit="W", digits=1,
+    ),
+    FioulBoilerSensorDescription(
+        "thermal_kw", KIND_MEASUREMENT, "thermal_kw",
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT, unit="kW", digits=2,
+    ),
+    FioulBoilerSensorDescription(
+        "flow_lph", KIND_MEASUREMENT, "flow_lph",
+        device_class=SensorDeviceClass.VOLUME_FLOW_RATE,
+        state_class=SensorStateClass.MEASUREMENT, unit="L/h", digits=2,
+    ),
+    # Identisch mit flow_lph; nur noch aus Kompatibilität, auf Wunsch
+    FioulBoilerSensorDescription(
+        "flow_filtered", KIND_MEASUREMENT, "flow_filtered",
+        device_class=SensorDeviceClass.VOLUME_FLOW_RATE,
+        state_class=SensorStateClass.MEASUREMENT, unit="L/h", digits=2,
+        optional="flow_filtered",
+    ),
+
+    # Persistent accumulation sensors
+    _liters("liters_total", None),
+    _liters("liters_daily", "day"),
+    _liters("liters_monthly", "month"),
+    _liters("liters_yearly", "year"),
+    _energy("energy_total_kwh", None),
+    _energy("energy_daily_kwh", "day"),
+    _energy("energy_monthly_kwh", "month"),
+    _energy("energy_yearly_kwh", "year"),
+
+    # Costs (FIFO über die Heizöl-Lieferungen)
+    _cost("cost_daily", "day"),
+    _cost("cost_monthly", "month"),
+    _cost("cost_yearly", "year"),
+    FioulBoilerSensorDescription(
+        "price_per_kwh", KIND_VALUE, "price_per_kwh",
+        state_class=SensorStateClass.MEASUREMENT, unit=f"{CURRENCY}/kWh", digits=4,
+        optional="cost",
+    ),
+)
 
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities
 ) -> None:
     """Set up Fioul boiler sensors from a config entry."""
-
     coordinator: FioulBoilerCoordinator = hass.data[DOMAIN][entry.entry_id]
-
-    entities: list[SensorEntity] = [
-        FioulBoilerStateSensor(coordinator, entry),
-        FioulBoilerPowerSensor(coordinator, entry),
-        FioulBoilerThermalPowerSensor(coordinator, entry),
-        FioulBoilerFlowSensor(coordinator, entry),
-        FioulBoilerFlowFilteredSensor(coordinator, entry),
-
-        # Persistent accumulation sensors
-        FioulBoilerLitersTotalSensor(coordinator, entry),
-        FioulBoilerLitersDailySensor(coordinator, entry),
-        FioulBoilerLitersMonthlySensor(coordinator, entry),
-        FioulBoilerLitersYearlySensor(coordinator, entry),
-        FioulBoilerEnergyTotalSensor(coordinator, entry),
-        FioulBoilerEnergyDailySensor(coordinator, entry),
-        FioulBoilerEnergyMonthlySensor(coordinator, entry),
-        FioulBoilerEnergyYearlySensor(coordinator, entry),
-    ]
-
-    async_add_entities(entities)
+    async_add_entities(async_build_sensors(coordinator))
+
+
+@callback
+def async_build_sensors(coordinator: FioulBoilerCoordinator) -> list[SensorEntity]:
+    """Create the enabled sensors; accumulators get their restored value up front."""
+    descriptions = enabled_descriptions(coordinator, SENSORS)
+    restored = async_restore_values(
+        coordinator.hass,
+        coordinator.entry.entry_id,
+        "sensor",
+        [d.key for d in descriptions if d.kind == KIND_ACCUMULATOR],
+    )
+
+    entities: list[SensorEntity] = []
+    for description in descriptions:
+        if description.kind == KIND_ACCUMULATOR:
+            entities.append(
+                FioulBoilerAccumSensor(coordinator, description, restored[description.key])
+            )
+        elif description.kind == KIND_MEASUREMENT:
+            entities.append(FioulBoilerMeasurementSensor(coordinator, description))
+        else:
+            entities.append(FioulBoilerSensor(coordinator, description))
+    return entities
 
 
 # ---------------------------------------------------------------------------
-# BASE CLASSES
+# BASE CLASS
 # ---------------------------------------------------------------------------
 
-class FioulBoilerBaseSensor(CoordinatorEntity[FioulBoilerCoordinator], SensorEntity):
-    """Base class for read-only coordinator values."""
-
-    _attr_has_entity_name = True
-
-    def __init__(self, coordinator: FioulBoilerCoordinator, entry: ConfigEntry) -> None:
-        super().__init__(coordinator)
-        self._entry = entry
-        self._attr_unique_id = f"{entry.entry_id}_{self.translation_key}"
-
-    @property
-    def device_info(self) -> dict[str, Any]:
-        return {
-            "identifiers": {(DOMAIN, self._entry.entry_id)},
-            "name": "Fioul boiler",
-        }
-
-
-class FioulBoilerStateSensor(FioulBoilerBaseSensor):
-    @property
-    def translation_key(self) -> str:
-        return "state"
-
-    @property
-    def native_value(self) -> str | None:
-        return self.coordinator.data.get("state_filtered")
-
-
-class FioulBoilerPowerSensor(FioulBoilerBaseSensor):
-    _attr_device_class = SensorDeviceClass.POWER
-    _attr_state_class = SensorStateClass.MEASUREMENT
-    _attr_native_unit_of_measurement = "W"
-
-    @property
-    def translation_key(self) -> str:
-        return "power"
-
-    @property
-    def native_value(self) -> float | None:
-        val = self.coordinator.data.get("power")
-        return round(val, 1) if isinstance(val, (int, float)) else None
-
-
-class FioulBoilerThermalPowerSensor(FioulBoilerBaseSensor):
-    _attr_device_class = SensorDeviceClass.POWER
-    _attr_state_class = SensorStateClass.MEASUREMENT
-    _attr_native_unit_of_measurement = "kW"
-
-    @property
-    def translation_key(self) -> str:
-        return "thermal_kw"
-
-    @property
-    def native_value(self) -> float | None:
-        val = self.coordinator.data.get("thermal_kw")
-        return round(val, 2) if isinstance(val, (int, float)) else None
-
-
-class FioulBoilerFlowSensor(FioulBoilerBaseSensor):
-    _attr_device_class = SensorDeviceClass.VOLUME_FLOW_RATE
-    _attr_state_class = SensorStateClass.MEASUREMENT
-    _attr_native_unit_of_measurement = "L/h"
-
-    @property
-    def translation_key(self) -> str:
-        return "flow_lph"
-
-    @property
-    def native_value(self) -> float | None:
-        val = self.coordinator.data.get("flow_lph")
-        return round(val, 2) if isinstance(val, (int, float)) else None
+class FioulBoilerSensor(FioulBoilerEntity, SensorEntity):
+    """Read-only coordinator value, optionally rounded."""
 
+    description: FioulBoilerSensorDescription
 
-class FioulBoilerFlowFilteredSensor(FioulBoilerBaseSensor):
-    _attr_device_class = SensorDeviceClass.VOLUME_FLOW_RATE
-    _attr_state_class = SensorStateClass.MEASUREMENT
-    _attr_native_unit_of_measurement = "L/h"
+    def __init__(
+        self, coordinator: FioulBoilerCoordinator, description: FioulBoilerSensorDescription
+    ) -> None:
+        super().__init__(coordinator, description)
+        self._data_key = description.data_key
+        self._digits = description.digits
+        self._attr_device_class = description.device_class
+        self._attr_state_class = description.state_class
+        unit = description.unit
+        if unit is not None and CURRENCY in unit:
+            unit = unit.format(currency=coordinator.hass.config.currency)
+        self._attr_native_unit_of_measurement = unit
 
     @property
-    def translation_key(self) -> str:
-        return "flow_filtered"
-
-    @property
-    def native_value(self) -> float | None:
-        val = self.coordinator.data.get("flow_filtered")
-        return round(val, 2) if isinstance(val, (int, float)) else None
+    def native_value(self) -> float | str | None:
+        val = self.coordinator.data.get(self._data_key)
+        if self._digits is not None and isinstance(val, (int, float)):
+            return round(val, self._digits)
+        return val
 
 
 # ---------------------------------------------------------------------------
-# PERSISTENT ACCUMULATION BASE CLASS
+# MEASUREMENTS (power, flow, thermal power)
 # ---------------------------------------------------------------------------
 
-class FioulBoilerAccumBase(FioulBoilerBaseSensor, RestoreEntity):
-    """Base class for persistent sensors with delta accumulation."""
-
-    _attr_native_value: float | None = None
-
-    def __init__(self, coordinator: FioulBoilerCoordinator, entry: ConfigEntry) -> None:
-        super().__init__(coordinator, entry)
-        self._last_update: datetime | None = None
-
-    async def async_added_to_hass(self) -> None:
-        """Restore last state from DB."""
-        await super().async_added_to_hass()
-
-        last_state = await self.async_get_last_state()
-        if last_state and last_state.state not in (STATE_UNKNOWN, STATE_UNAVAILABLE):
-            try:
-                self._attr_native_value = float(last_state.state)
-            except Exception:
-                self._attr_native_value = 0.0
-        else:
-            self._attr_native_value = 0.0
-
-        self._last_update = None
-
-    # Default behavior: child classes override this
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        self.async_write_ha_state()
-
-
-# ---------------------------------------------------------------------------
-# LITER SENSORS
-# ---------------------------------------------------------------------------
-
-class FioulBoilerLitersTotalSensor(FioulBoilerAccumBase):
-    _attr_state_class = SensorStateClass.TOTAL_INCREASING
-    _attr_native_unit_of_measurement = "L"
-
-    @property
-    def translation_key(self) -> str:
-        return "liters_total"
-
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        delta = self.coordinator.data.get("delta_liters") or 0.0
-        current = float(self._attr_native_value or 0.0)
-        self._attr_native_value = round(current + float(delta), 3)
-        self.async_write_ha_state()
-
-
-class FioulBoilerLitersDailySensor(FioulBoilerAccumBase):
-    _attr_state_class = SensorStateClass.TOTAL_INCREASING
-    _attr_native_unit_of_measurement = "L"
-
-    def __init__(self, coordinator, entry):
-        super().__init__(coordinator, entry)
-        self._last_day = None
-
-    @property
-    def translation_key(self) -> str:
-        return "liters_daily"
-
-    async def async_added_to_hass(self) -> None:
-        await super().async_added_to_hass()
-        now = dt_util.now()
-        self._last_day = now.day
-
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        delta = self.coordinator.data.get("delta_liters") or 0.0
-        now = dt_util.now()
-
-        if self._last_day is None or now.day != self._last_day:
-            current = 0.0
-            self._last_day = now.day
-        else:
-            current = float(self._attr_native_value or 0.0)
-
-        self._attr_native_value = round(current + float(delta), 3)
-        self.async_write_ha_state()
-
+class FioulBoilerMeasurementSensor(FioulBoilerSensor):
+    """
+    Fast-changing measurement.
 
-class FioulBoilerLitersMonthlySensor(FioulBoilerAccumBase):
-    _attr_state_class = SensorStateClass.TOTAL_INCREASING
-    _attr_native_unit_of_measurement = "L"
+    Mit ``publish_window`` > 0 wird nicht jeder Tick geschrieben, sondern
+    einmal pro Fenster der zeitgewichtete Mittelwert, mit min/max/mean/twa
+    als Attributen.
+    """
 
-    def __init__(self, coordinator, entry):
-        super().__init__(coordinator, entry)
-        self._last_month = None
+    def __init__(
+        self, coordinator: FioulBoilerCoordinator, description: FioulBoilerSensorDescription
+    ) -> None:
+        super().__init__(coordinator, description)
+        # Fensterstatistik nur, wenn sie gebraucht wird
+        self._window: WindowStats | None = WindowStats() if coordinator.publish_window else None
+        self._window_value: float | None = None
 
     @property
-    def translation_key(self) -> str:
-        return "liters_monthly"
-
-    async def async_added_to_hass(self) -> None:
-        await super().async_added_to_hass()
-        now = dt_util.now()
-        self._last_month = now.month
-
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        delta = self.coordinator.data.get("delta_liters") or 0.0
-        now = dt_util.now()
-
-        if self._last_month is None or now.month != self._last_month:
-            current = 0.0
-            self._last_month = now.month
-        else:
-            current = float(self._attr_native_value or 0.0)
-
-        self._attr_native_value = round(current + float(delta), 3)
-        self.async_write_ha_state()
-
-
-class FioulBoilerLitersYearlySensor(FioulBoilerAccumBase):
-    _attr_state_class = SensorStateClass.TOTAL_INCREASING
-    _attr_native_unit_of_measurement = "L"
-
-    def __init__(self, coordinator, entry):
-        super().__init__(coordinator, entry)
-        self._last_year = None
-
-    @property
-    def translation_key(self) -> str:
-        return "liters_yearly"
-
-    async def async_added_to_hass(self) -> None:
-        await super().async_added_to_hass()
-        now = dt_util.now()
-        self._last_year = now.year
+    def native_value(self) -> float | None:
+        if self._window is not None:
+            return self._window_value
+        return super().native_value
 
     @callback
     def _handle_coordinator_update(self) -> None:
-        delta = self.coordinator.data.get("delta_liters") or 0.0
-        now = dt_util.now()
-
-        if self._last_year is None or now.year != self._last_year:
-            current = 0.0
-            self._last_year = now.year
+        window = self._window
+        if window is None:
+            self.async_write_ha_state()
+            return
+
+        val = self.coordinator.data.get(self._data_key)
+        if not isinstance(val, (int, float)):
+            return
+
+        now = monotonic()
+        window.add(float(val), now)
+
+        if self._window_value is None:
+            # Erster Wert sofort, danach einmal pro Fenster
+            self._window_value = round(val, self._digits)
+        elif window.elapsed(now) < self.coordinator.publish_window:
+            return
         else:
-            current = float(self._attr_native_value or 0.0)
+            stats = window.publish(now)
+            if stats is None:
+                return
+            self._window_value = round(stats["twa"], self._digits)
+            self._attr_extra_state_attributes = {
+                key: round(value, self._digits) for key, value in stats.items()
+            }
 
-        self._attr_native_value = round(current + float(delta), 3)
         self.async_write_ha_state()
 
 
 # ---------------------------------------------------------------------------
-# ENERGY SENSORS
+# PERSISTENT ACCUMULATION (liters, energy, cost)
 # ---------------------------------------------------------------------------
 
-class FioulBoilerEnergyTotalSensor(FioulBoilerAccumBase):
-    _attr_device_class = SensorDeviceClass.ENERGY
-    _attr_state_class = SensorStateClass.TOTAL_INCREASING
-    _attr_native_unit_of_measurement = "kWh"
+class FioulBoilerAccumSensor(FioulBoilerSensor, RestoreEntity):
+    """
+    Persistent sensor summing a coordinator delta over a period.
+
+    Der letzte Wert wird gesammelt beim Aufbau der Plattform übergeben
+    (``async_restore_values``). Zu Beginn jeder Periode wird auf 0 gesetzt
+    und ``last_reset`` gemeldet. ``state_class`` ist TOTAL (nicht
+    TOTAL_INCREASING), damit negative Korrekturen der Nachberechnung nicht
+    als Zählerreset in die Statistik eingehen.
+    Ohne Delta und ohne Periodenwechsel wird nichts geschrieben.
+    """
+
+    def __init__(
+        self,
+        coordinator: FioulBoilerCoordinator,
+        description: FioulBoilerSensorDescription,
+        restored: Optional[float],
+    ) -> None:
+        super().__init__(coordinator, description)
+        self._attr_native_value: float = restored or 0.0
+        self._period_fields = PERIOD_FIELDS[description.period]
+        self._period_key: tuple[int, ...] = ()
+        # Periodensensoren melden ihren Reset über last_reset, Gesamtsensoren nie
+        self._has_last_reset = (
+            description.state_class == SensorStateClass.TOTAL and description.period is not None
+        )
 
     @property
-    def translation_key(self) -> str:
-        return "energy_total_kwh"
+    def native_value(self) -> float:
+        return self._attr_native_value
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        delta = self.coordinator.data.get("delta_energy_kwh") or 0.0
-        current = float(self._attr_native_value or 0.0)
-        self._attr_native_value = round(current + float(delta), 4)
-        self.async_write_ha_state()
-
-
-class FioulBoilerEnergyDailySensor(FioulBoilerAccumBase):
-    _attr_device_class = SensorDeviceClass.ENERGY
-    _attr_state_class = SensorStateClass.TOTAL_INCREASING
-    _attr_native_unit_of_measurement = "kWh"
-
-    def __init__(self, coordinator, entry):
-        super().__init__(coordinator, entry)
-        self._last_day = None
-
-    @property
-    def translation_key(self) -> str:
-        return "energy_daily_kwh"
+    def _start_of_period(self, now: datetime) -> datetime:
+        start = dt_util.start_of_local_day(now)
+        if self._period_fields == PERIOD_FIELDS["month"]:
+            start = start.replace(day=1)
+        elif self._period_fields == PERIOD_FIELDS["year"]:
+            start = start.replace(month=1, day=1)
+        return start
 
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
-        self._last_day = dt_util.now().day
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        delta = self.coordinator.data.get("delta_energy_kwh") or 0.0
         now = dt_util.now()
+        self._period_key = (now.year, now.month, now.day)[: self._period_fields]
+        if self._has_last_reset:
+            self._attr_last_reset = self._start_of_period(now)
 
-        if self._last_day is None or now.day != self._last_day:
-            current = 0.0
-            self._last_day = now.day
-        else:
-            current = float(self._attr_native_value or 0.0)
-
-        self._attr_native_value = round(current + float(delta), 4)
-        self.async_write_ha_state()
-
-
-class FioulBoilerEnergyMonthlySensor(FioulBoilerAccumBase):
-    _attr_device_class = SensorDeviceClass.ENERGY
-    _attr_state_class = SensorStateClass.TOTAL_INCREASING
-    _attr_native_unit_of_measurement = "kWh"
-
-    def __init__(self, coordinator, entry):
-        super().__init__(coordinator, entry)
-        self._last_month = None
+        accumulators = self.coordinator.accumulators
+        accumulators.append(self)
+        self.async_on_remove(lambda: accumulators.remove(self))
 
     @property
-    def translation_key(self) -> str:
-        return "energy_monthly_kwh"
+    def correction_key(self) -> str:
+        """Coordinator delta (and recompute correction) this sensor sums."""
+        return self._data_key
 
-    async def async_added_to_hass(self) -> None:
-        await super().async_added_to_hass()
-        self._last_month = dt_util.now().month
+    def in_period(self, day: date, today: date) -> bool:
+        fields = self._period_fields
+        return (
+            (day.year, day.month, day.day)[:fields]
+            == (today.year, today.month, today.day)[:fields]
+        )
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        delta = self.coordinator.data.get("delta_energy_kwh") or 0.0
-        now = dt_util.now()
-
-        if self._last_month is None or now.month != self._last_month:
-            current = 0.0
-            self._last_month = now.month
-        else:
-            current = float(self._attr_native_value or 0.0)
+    def async_apply_correction(
+        self, corrections: dict[str, dict[date, float]]
+    ) -> dict[date, float]:
+        """
+        Add the per-day corrections that fall into this sensor's period.
+
+        Returns the days booked as state jump, so the caller can take them
+        back out of the long-term statistics.
+        """
+        today = dt_util.now().date()
+        applied = {
+            day: value
+            for day, value in corrections.get(self._data_key, {}).items()
+            if self.in_period(day, today)
+        }
+        delta = sum(applied.values())
+        if not delta:
+            return {}
 
-        self._attr_native_value = round(current + float(delta), 4)
+        self._attr_native_value = round(max(self._attr_native_value + delta, 0.0), self._digits)
         self.async_write_ha_state()
-
-
-class FioulBoilerEnergyYearlySensor(FioulBoilerAccumBase):
-    _attr_device_class = SensorDeviceClass.ENERGY
-    _attr_state_class = SensorStateClass.TOTAL_INCREASING
-    _attr_native_unit_of_measurement = "kWh"
-
-    def __init__(self, coordinator, entry):
-        super().__init__(coordinator, entry)
-        self._last_year = None
-
-    @property
-    def translation_key(self) -> str:
-        return "energy_yearly_kwh"
-
-    async def async_added_to_hass(self) -> None:
-        await super().async_added_to_hass()
-        self._last_year = dt_util.now().year
+        return applied
 
     @callback
     def _handle_coordinator_update(self) -> None:
-        delta = self.coordinator.data.get("delta_energy_kwh") or 0.0
-        now = dt_util.now()
-
-        if self._last_year is None or now.year != self._last_year:
-            current = 0.0
-            self._last_year = now.year
-        else:
-            current = float(self._attr_native_value or 0.0)
-
-        self._attr_native_value = round(current + float(delta), 4)
+        delta = self.coordinator.data.get(self._data_key) or 0.0
+        current = self._attr_native_value
+        reset = False
+
+        if self._period_fields:
+            now = dt_util.now()
+            period_key = (now.year, now.month, now.day)[: self._period_fields]
+            if period_key != self._period_key:
+                self._period_key = period_key
+                current = 0.0
+                reset = True
+                if self._has_last_reset:
+                    self._attr_last_reset = self._start_of_period(now)
+
+        if not delta and not reset:
+            return
+
+        self._attr_native_value = round(current + float(delta), self._digits)
         self.async_write_ha_state()
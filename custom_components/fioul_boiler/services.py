@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    SERVICE_EXPORT,
+    SERVICE_RECOMPUTE,
+    SERVICE_ADD_DELIVERY,
+    ATTR_ENTRY_ID,
+    ATTR_START_DATE,
+    ATTR_END_DATE,
+    ATTR_FORMAT,
+    ATTR_FILENAME,
+    ATTR_LITERS,
+    ATTR_PRICE_PER_LITER,
+    ATTR_DATE,
+    EXPORT_FORMATS,
+)
+from .coordinator import FioulBoilerCoordinator
+from .export import async_export
+from .recompute import async_recompute
+
+EXPORT_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_ENTRY_ID): cv.string,
+        vol.Required(ATTR_START_DATE): cv.date,
+        vol.Required(ATTR_END_DATE): cv.date,
+        vol.Optional(ATTR_FORMAT, default="csv"): vol.In(EXPORT_FORMATS),
+        vol.Optional(ATTR_FILENAME, default="fioul_boiler_export"): cv.string,
+    }
+)
+
+RECOMPUTE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_ENTRY_ID): cv.string,
+        vol.Required(ATTR_START_DATE): cv.date,
+        vol.Required(ATTR_END_DATE): cv.date,
+    }
+)
+
+ADD_DELIVERY_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_ENTRY_ID): cv.string,
+        vol.Required(ATTR_LITERS): vol.All(vol.Coerce(float), vol.Range(min=0, min_included=False)),
+        vol.Required(ATTR_PRICE_PER_LITER): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(ATTR_DATE): cv.date,
+    }
+)
+
+
+def _get_coordinator(hass: HomeAssistant, call: ServiceCall) -> FioulBoilerCoordinator:
+    """Coordinator addressed by a service call; entry_id may be omitted with one boiler."""
+    coordinators: dict[str, FioulBoilerCoordinator] = hass.data.get(DOMAIN, {})
+    entry_id = call.data.get(ATTR_ENTRY_ID)
+
+    if entry_id is None:
+        if len(coordinators) != 1:
+            raise HomeAssistantError("entry_id is required when several boilers are configured")
+        return next(iter(coordinators.values()))
+
+    if entry_id not in coordinators:
+        raise HomeAssistantError(f"Unknown fioul boiler entry: {entry_id}")
+    return coordinators[entry_id]
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services."""
+
+    async def _async_export(call: ServiceCall) -> None:
+        coordinator = _get_coordinator(hass, call)
+        await async_export(
+            hass,
+            coordinator.entry,
+            call.data[ATTR_START_DATE],
+            call.data[ATTR_END_DATE],
+            call.data[ATTR_FORMAT],
+            call.data[ATTR_FILENAME],
+        )
+
+    async def _async_recompute(call: ServiceCall) -> None:
+        coordinator = _get_coordinator(hass, call)
+        await async_recompute(
+            hass,
+            coordinator,
+            call.data[ATTR_START_DATE],
+            call.data[ATTR_END_DATE],
+        )
+
+    @callback
+    def _async_add_delivery(call: ServiceCall) -> None:
+        coordinator = _get_coordinator(hass, call)
+        delivered = call.data.get(ATTR_DATE) or dt_util.now().date()
+        coordinator.async_add_fuel_lot(
+            call.data[ATTR_LITERS],
+            call.data[ATTR_PRICE_PER_LITER],
+            delivered.isoformat(),
+        )
+
+    hass.services.async_register(DOMAIN, SERVICE_EXPORT, _async_export, schema=EXPORT_SCHEMA)
+    hass.services.async_register(
+        DOMAIN, SERVICE_ADD_DELIVERY, _async_add_delivery, schema=ADD_DELIVERY_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_RECOMPUTE, _async_recompute, schema=RECOMPUTE_SCHEMA
+    )
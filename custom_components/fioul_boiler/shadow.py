@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Optional
+import json
+import logging
+
+import voluptuous as vol
+
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CONF_LPH_RUN,
+    CONF_DEBOUNCE,
+    CONF_KWH_PER_LITER,
+    CONF_FLOW_TABLE,
+    CONF_FLOW_INTERPOLATE,
+    DEFAULT_THRESHOLDS,
+    SHADOW_HISTORY_DAYS,
+)
+from .engine import BoilerEngine
+from .flow_model import format_flow_table, parse_flow_table
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _flow_table(value: Any) -> list[list[float]]:
+    """Flow table as option text (``"200:1.4, 320:2.6"``) or as stored ``[[W, L/h], ...]``."""
+    try:
+        if isinstance(value, str):
+            return parse_flow_table(value)
+        if isinstance(value, list):
+            return parse_flow_table(format_flow_table(value))
+    except (TypeError, ValueError) as err:
+        raise vol.Invalid(f"invalid flow table: {err}") from err
+    raise vol.Invalid("flow table must be a string")
+
+
+# In Schatten-Konfigurationen überschreibbare Optionen und ihre Typen
+SHADOW_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_LPH_RUN): vol.All(
+            vol.Coerce(float), vol.Range(min=0, min_included=False)
+        ),
+        vol.Optional(CONF_DEBOUNCE): vol.All(vol.Coerce(int), vol.Range(min=0)),
+        vol.Optional(CONF_KWH_PER_LITER): vol.All(
+            vol.Coerce(float), vol.Range(min=0, min_included=False)
+        ),
+        vol.Optional(CONF_FLOW_TABLE): _flow_table,
+        vol.Optional(CONF_FLOW_INTERPOLATE): bool,
+        vol.Optional("thresholds"): {vol.In(list(DEFAULT_THRESHOLDS)): vol.Coerce(float)},
+    }
+)
+
+
+def parse_shadow_configs(text: str) -> dict[str, dict[str, Any]]:
+    """
+    Parse the shadow option: a JSON object ``{name: overrides}``.
+
+    Example: ``{"debounce_20": {"debounce": 20}, "pompe_80": {"thresholds": {"pompe": 80}}}``.
+    Values are checked and normalized with ``SHADOW_SCHEMA`` (``flow_table``
+    in the same text format as the option field). Raises ValueError on
+    malformed input, unknown keys or invalid values.
+    """
+    if not text.strip():
+        return {}
+
+    configs = json.loads(text)
+    if not isinstance(configs, dict):
+        raise ValueError("Shadow configurations must be a JSON object")
+
+    validated: dict[str, dict[str, Any]] = {}
+    for name, overrides in configs.items():
+        if not isinstance(overrides, dict):
+            raise ValueError(f"Shadow {name!r} must be an object")
+        try:
+            validated[name] = SHADOW_SCHEMA(overrides)
+        except vol.Invalid as err:
+            raise ValueError(f"Shadow {name!r}: {err}") from err
+
+    return validated
+
+
+def _day_metrics() -> dict[str, float]:
+    return {"cycles": 0, "burn_s": 0.0, "liters": 0.0}
+
+
+def _accumulate(metrics: dict[str, float], result: dict[str, Any]) -> None:
+    metrics["liters"] += result["delta_liters"]
+    cycle = result["cycle_completed"]
+    if cycle is not None:
+        metrics["cycles"] += 1
+        metrics["burn_s"] += cycle["duration_s"]
+
+
+class ShadowEvaluator:
+    """
+    Run alternative configurations on the live power samples.
+
+    Jede Schatten-Konfiguration ist eine eigene ``BoilerEngine`` mit
+    überschriebenen Optionen; sie bucht nichts und feuert keine Ereignisse.
+    Pro Tag werden Zyklen, Brennzeit und Liter von Live- und
+    Schatten-Engines gesammelt und die Abweichung in den Diagnosedaten
+    ausgegeben. Kosten pro Tick: ein ``step`` je Schatten-Engine.
+
+    Ein Schatten darf die Live-Engine nie stören: scheitert sein Aufbau
+    oder ein ``step``, wird nur er abgeschaltet (``failed``).
+    """
+
+    def __init__(
+        self,
+        data: dict[str, Any],
+        options: dict[str, Any],
+        configs: dict[str, dict[str, Any]],
+    ) -> None:
+        self.configs = configs
+        self.failed: dict[str, str] = {}
+        self._engines: dict[str, BoilerEngine] = {}
+        for name, overrides in configs.items():
+            shadow_options = {**options, **overrides}
+            shadow_options["thresholds"] = {
+                **(options.get("thresholds") or {}),
+                **overrides.get("thresholds", {}),
+            }
+            try:
+                self._engines[name] = BoilerEngine.from_entry_data(data, shadow_options)
+            except Exception as err:  # noqa: BLE001 - Schatten nie fatal
+                self._disable(name, err)
+
+        self._day_end: Optional[datetime] = None
+        self._current: dict[str, Any] = {}
+        self.history: deque[dict[str, Any]] = deque(maxlen=SHADOW_HISTORY_DAYS)
+
+    def _start_day(self, now: datetime) -> None:
+        local = dt_util.as_local(now)
+        self._day_end = dt_util.start_of_local_day(local.date() + timedelta(days=1))
+        self._current = {
+            "date": local.date().isoformat(),
+            "live": _day_metrics(),
+            "shadows": {name: _day_metrics() for name in self._engines},
+        }
+
+    def step(self, now: datetime, power: float, live: dict[str, Any]) -> None:
+        if self._day_end is None:
+            self._start_day(now)
+        elif now >= self._day_end:
+            self.history.append(self._summarize(self._current))
+            self._start_day(now)
+
+        current = self._current
+        _accumulate(current["live"], live)
+        shadows = current["shadows"]
+        for name, engine in list(self._engines.items()):
+            try:
+                _accumulate(shadows[name], engine.step(now, power))
+            except Exception as err:  # noqa: BLE001 - Schatten nie fatal
+                self._disable(name, err)
+
+    def _disable(self, name: str, err: Exception) -> None:
+        _LOGGER.warning("Shadow configuration %r disabled: %s", name, err)
+        self._engines.pop(name, None)
+        self.failed[name] = str(err)
+
+    def shift(self, offset: timedelta) -> None:
+        for engine in self._engines.values():
+            engine.shift(offset)
+
+    @staticmethod
+    def _summarize(day: dict[str, Any]) -> dict[str, Any]:
+        live = day["live"]
+        summary: dict[str, Any] = {
+            "date": day["date"],
+            "live": {key: round(value, 3) for key, value in live.items()},
+            "shadows": {},
+        }
+        for name, metrics in day["shadows"].items():
+            summary["shadows"][name] = {
+                **{key: round(value, 3) for key, value in metrics.items()},
+                "divergence": {
+                    key: round(metrics[key] - live[key], 3) for key in live
+                },
+            }
+        return summary
+
+    def diagnostics(self) -> dict[str, Any]:
+        days = list(self.history)
+        if self._current:
+            days.append(self._summarize(self._current))
+        return {"configs": self.configs, "failed": self.failed, "days": days}
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from typing import Any, Optional
+
+from homeassistant.util import dt as dt_util
+
+from .const import STATE_KEYS
+
+# Toleranz für den Start bzw. eine Unterbrechung der Erfassung
+SUMMARY_TOLERANCE = timedelta(seconds=60)
+
+
+class DailySummary:
+    """
+    Running totals for the current day, fed once per coordinator tick.
+
+    Alles wird inkrementell mitgezählt, damit um Mitternacht nur noch ein
+    fertiges Ereignis gefeuert werden muss.
+
+    ``since`` ist der Beginn der Erfassung für den laufenden Tag. Beginnt
+    sie nicht um Mitternacht oder war sie unterbrochen (Neustart), wird
+    die Zusammenfassung als ``partial`` gekennzeichnet. Die Zwischenstände
+    werden über ``as_dict`` / ``load`` gesichert.
+    """
+
+    def __init__(self) -> None:
+        self._last_time: Optional[datetime] = None
+        self._last_state: Optional[str] = None
+        self.since: Optional[datetime] = None
+        self.interrupted = False
+        self._reset()
+
+    def _reset(self) -> None:
+        self.cycles = 0
+        self.liters = 0.0
+        self.energy_kwh = 0.0
+        self.cost = 0.0
+        self.burn_s = 0.0
+        self.preheat_s = 0.0
+        self.faults: dict[str, int] = {"phc": 0, "absence": 0}
+        self.state_s: dict[str, float] = dict.fromkeys(STATE_KEYS.values(), 0.0)
+
+    def add(self, now: datetime, data: dict[str, Any]) -> None:
+        if self.since is None:
+            self.since = now
+        if self._last_state is not None and self._last_time is not None:
+            key = STATE_KEYS.get(self._last_state)
+            if key is not None:
+                self.state_s[key] += (now - self._last_time).total_seconds()
+        self._last_time = now
+        self._last_state = data["state_filtered"]
+
+        self.liters += data["delta_liters"]
+        self.energy_kwh += data["delta_energy_kwh"]
+        self.cost += data.get("delta_cost", 0.0)
+
+        cycle = data.get("cycle_completed")
+        if cycle is not None:
+            self.cycles += 1
+            self.burn_s += cycle["duration_s"]
+            self.preheat_s += cycle["preheat_s"]
+
+    def skip(self, now: datetime) -> None:
+        """Move on to ``now`` without counting the interval (frozen source gap)."""
+        if self._last_time is not None:
+            self._last_time = now
+
+    def add_fault(self, fault: str) -> None:
+        self.faults[fault] += 1
+
+    def pop(self, day: date, now: datetime) -> dict[str, Any]:
+        """Close the day at ``now`` and return its summary."""
+        if self._last_time is not None:
+            # Laufenden Zustand bis Mitternacht anrechnen
+            self.add(now, {
+                "state_filtered": self._last_state,
+                "delta_liters": 0.0,
+                "delta_energy_kwh": 0.0,
+            })
+
+        since = self.since
+        partial = (
+            since is None
+            or self.interrupted
+            or since - dt_util.start_of_local_day(day) > SUMMARY_TOLERANCE
+        )
+
+        summary = {
+            "date": day.isoformat(),
+            "since": since.isoformat() if since is not None else None,
+            "partial": partial,
+            "cycles": self.cycles,
+            "liters": round(self.liters, 3),
+            "energy_kwh": round(self.energy_kwh, 3),
+            "cost": round(self.cost, 2),
+            "burn_s": round(self.burn_s),
+            "preheat_s": round(self.preheat_s),
+            "faults": dict(self.faults),
+            "state_s": {key: round(value) for key, value in self.state_s.items()},
+        }
+        self._reset()
+        self.since = now
+        self.interrupted = False
+        return summary
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "since": self.since.isoformat() if self.since is not None else None,
+            "last_time": self._last_time.isoformat() if self._last_time is not None else None,
+            "interrupted": self.interrupted,
+            "cycles": self.cycles,
+            "liters": self.liters,
+            "energy_kwh": self.energy_kwh,
+            "cost": self.cost,
+            "burn_s": self.burn_s,
+            "preheat_s": self.preheat_s,
+            "faults": dict(self.faults),
+            "state_s": dict(self.state_s),
+        }
+
+    def load(self, data: dict[str, Any], now: datetime) -> None:
+        """
+        Restore the running totals of today; stored totals of an earlier day are dropped.
+
+        Die Zeit zwischen letzter Sicherung und ``now`` ist unbekannt:
+        sie wird keinem Zustand zugerechnet, und ist sie länger als die
+        Toleranz, gilt der Tag als unterbrochen.
+        """
+        since = dt_util.parse_datetime(data.get("since") or "")
+        last_time = dt_util.parse_datetime(data.get("last_time") or "")
+        if since is None or dt_util.as_local(since).date() != dt_util.as_local(now).date():
+            return
+
+        self.since = since
+        self.interrupted = bool(data.get("interrupted")) or (
+            last_time is None or now - last_time > SUMMARY_TOLERANCE
+        )
+        self.cycles = data.get("cycles", 0)
+        self.liters = data.get("liters", 0.0)
+        self.energy_kwh = data.get("energy_kwh", 0.0)
+        self.cost = data.get("cost", 0.0)
+        self.burn_s = data.get("burn_s", 0.0)
+        self.preheat_s = data.get("preheat_s", 0.0)
+        self.faults.update(data.get("faults", {}))
+        self.state_s.update(data.get("state_s", {}))
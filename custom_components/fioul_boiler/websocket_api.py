@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+from time import monotonic
+from typing import Any, Optional
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import DOMAIN, CYCLE_HISTORY_SIZE
+from .coordinator import FioulBoilerCoordinator
+
+# Live-Werte und ihre Rundung (weniger Rauschen → kleinere Deltas)
+TELEMETRY_KEYS: dict[str, Optional[int]] = {
+    "power": 1,
+    "state_raw": None,
+    "state_filtered": None,
+    "burner_running": None,
+    "flow_lph": 2,
+    "thermal_kw": 2,
+    "error_phc": None,
+    "error_absence": None,
+    "error_global": None,
+    "source_gap": None,
+}
+
+
+@callback
+def async_setup_websocket(hass: HomeAssistant) -> None:
+    """Register the websocket commands."""
+    websocket_api.async_register_command(hass, ws_subscribe)
+    websocket_api.async_register_command(hass, ws_cycles)
+
+
+def _get_coordinator(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> Optional[FioulBoilerCoordinator]:
+    coordinator = hass.data.get(DOMAIN, {}).get(msg["entry_id"])
+    if coordinator is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "Unknown fioul boiler entry")
+    return coordinator
+
+
+def _telemetry(data: dict[str, Any]) -> dict[str, Any]:
+    values: dict[str, Any] = {}
+    for key, digits in TELEMETRY_KEYS.items():
+        value = data.get(key)
+        if digits is not None and isinstance(value, (int, float)):
+            value = round(value, digits)
+        values[key] = value
+    return values
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/subscribe",
+        vol.Required("entry_id"): str,
+        # Maximale Nachrichtenrate in Hz
+        vol.Optional("max_rate", default=1.0): vol.All(
+            vol.Coerce(float), vol.Range(min=0.01, max=10.0)
+        ),
+    }
+)
+@callback
+def ws_subscribe(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """
+    Stream live telemetry of one boiler.
+
+    Die erste Nachricht enthält alle Werte, danach nur geänderte Schlüssel.
+    Updates innerhalb von ``1 / max_rate`` Sekunden werden zusammengefasst;
+    der letzte Stand wird am Ende des Intervalls nachgeliefert.
+
+    Wird der Eintrag entladen (auch beim Neuladen nach geänderten Optionen),
+    kommt ``{"closed": "entry_unloaded"}`` und das Abo endet; der Client
+    muss sich neu anmelden.
+    """
+    coordinator = _get_coordinator(hass, connection, msg)
+    if coordinator is None:
+        return
+
+    min_interval = 1.0 / msg["max_rate"]
+    sent: dict[str, Any] = {}
+    last_sent = 0.0
+    pending: Optional[CALLBACK_TYPE] = None
+
+    @callback
+    def _async_send(_now: Any = None) -> None:
+        nonlocal last_sent, pending
+        pending = None
+        last_sent = monotonic()
+
+        values = _telemetry(coordinator.data or {})
+        delta = {
+            key: value
+            for key, value in values.items()
+            if key not in sent or sent[key] != value
+        }
+        if not delta:
+            return
+        sent.update(delta)
+        connection.send_message(websocket_api.event_message(msg["id"], delta))
+
+    @callback
+    def _async_coordinator_updated() -> None:
+        nonlocal pending
+        if pending is not None:
+            return
+        wait = min_interval - (monotonic() - last_sent)
+        if wait <= 0:
+            _async_send()
+        else:
+            pending = async_call_later(hass, wait, _async_send)
+
+    unsub_listener = coordinator.async_add_listener(_async_coordinator_updated)
+
+    @callback
+    def _async_unsubscribe() -> None:
+        unsub_listener()
+        coordinator.subscriptions.discard(_async_entry_unloaded)
+        if pending is not None:
+            pending()
+
+    @callback
+    def _async_entry_unloaded() -> None:
+        if connection.subscriptions.pop(msg["id"], None) is None:
+            return
+        _async_unsubscribe()
+        connection.send_message(
+            websocket_api.event_message(msg["id"], {"closed": "entry_unloaded"})
+        )
+
+    connection.subscriptions[msg["id"]] = _async_unsubscribe
+    coordinator.subscriptions.add(_async_entry_unloaded)
+    connection.send_result(msg["id"])
+    _async_send()
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/cycles",
+        vol.Required("entry_id"): str,
+        vol.Optional("limit", default=CYCLE_HISTORY_SIZE): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=CYCLE_HISTORY_SIZE)
+        ),
+    }
+)
+@callback
+def ws_cycles(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Return the most recent completed burn cycles, oldest first."""
+    coordinator = _get_coordinator(hass, connection, msg)
+    if coordinator is None:
+        return
+
+    cycles = list(coordinator.cycles)[-msg["limit"]:]
+    connection.send_result(msg["id"], {"cycles": cycles})
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from typing import Optional
+
+
+class WindowStats:
+    """
+    Running min / max / mean / time-weighted average over one publish window.
+
+    Jeder Wert gilt bis zum nächsten (sample-and-hold); der zeitgewichtete
+    Mittelwert ist daher für Energie-Integrationen korrekt, auch wenn die
+    Quelle unregelmäßig meldet. Speicherbedarf und Kosten pro Wert: O(1).
+    """
+
+    __slots__ = (
+        "_start",
+        "_last_time",
+        "_last_value",
+        "_count",
+        "_sum",
+        "_weighted",
+        "_min",
+        "_max",
+    )
+
+    def __init__(self) -> None:
+        self._start: Optional[float] = None
+        self._last_time: Optional[float] = None
+        self._last_value: Optional[float] = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self._count = 0
+        self._sum = 0.0
+        self._weighted = 0.0
+        self._min = float("inf")
+        self._max = float("-inf")
+
+    def add(self, value: float, now: float) -> None:
+        if self._start is None:
+            self._start = now
+        elif self._last_value is not None and self._last_time is not None:
+            self._weighted += self._last_value * (now - self._last_time)
+
+        self._last_time = now
+        self._last_value = value
+        self._count += 1
+        self._sum += value
+        if value < self._min:
+            self._min = value
+        if value > self._max:
+            self._max = value
+
+    def elapsed(self, now: float) -> float:
+        return 0.0 if self._start is None else now - self._start
+
+    def publish(self, now: float) -> Optional[dict[str, float]]:
+        """Close the window at ``now``; the last value carries into the next one."""
+        if self._start is None or self._last_value is None:
+            return None
+
+        if self._last_value is not None and self._last_time is not None:
+            self._weighted += self._last_value * (now - self._last_time)
+        duration = now - self._start
+
+        stats = {
+            "min": self._min,
+            "max": self._max,
+            "mean": self._sum / self._count if self._count else self._last_value,
+            "twa": self._weighted / duration if duration > 0 else self._last_value,
+        }
+
+        # Der gehaltene Wert gehört auch zum nächsten Fenster
+        self._start = now
+        self._last_time = now
+        self._reset()
+        self._min = self._max = self._last_value
+        return stats
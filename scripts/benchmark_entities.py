@@ -0,0 +1,104 @@
+"""
+Memory and setup-time benchmark of the per-boiler entity footprint.
+
+Builds ``--boilers`` coordinators with their sensor and binary sensor
+entities inside a bare Home Assistant core and reports, per boiler, the
+allocated memory (tracemalloc) and the setup time. Requires a Home
+Assistant development environment; run from the repository root:
+
+    python scripts/benchmark_entities.py --boilers 100
+    python scripts/benchmark_entities.py --boilers 100 --optional cost,flow_filtered
+"""
+from __future__ import annotations
+
+from types import SimpleNamespace
+import argparse
+import asyncio
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "custom_components"))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.helpers import entity_registry as er, restore_state  # noqa: E402
+
+from fioul_boiler.binary_sensor import async_build_binary_sensors  # noqa: E402
+from fioul_boiler.const import (  # noqa: E402
+    CONF_OPTIONAL_ENTITIES,
+    CONF_POWER_SENSORS,
+    CONF_SOURCE_WEIGHTS,
+)
+from fioul_boiler.coordinator import FioulBoilerCoordinator  # noqa: E402
+from fioul_boiler.sensor import async_build_sensors  # noqa: E402
+
+
+def _build_boiler(hass: HomeAssistant, index: int, optional: list[str]) -> list:
+    entity_id = f"sensor.bench_boiler_{index}_power"
+    entry = SimpleNamespace(
+        entry_id=f"bench_{index}",
+        title=f"Benchmark boiler {index}",
+        data={CONF_POWER_SENSORS: [entity_id], CONF_SOURCE_WEIGHTS: {entity_id: 1.0}},
+        options={CONF_OPTIONAL_ENTITIES: optional},
+    )
+    coordinator = FioulBoilerCoordinator(hass, entry)
+    return [coordinator, *async_build_sensors(coordinator), *async_build_binary_sensors(coordinator)]
+
+
+async def async_run(boilers: int, optional: list[str]) -> None:
+    with tempfile.TemporaryDirectory() as config_dir:
+        try:
+            hass = HomeAssistant(config_dir)
+        except TypeError:  # ältere Core-Versionen
+            hass = HomeAssistant()
+            hass.config.config_dir = config_dir
+        await er.async_load(hass)
+        await restore_state.async_load(hass)
+
+        # Einmalige Import-/Cache-Kosten nicht mitmessen
+        _build_boiler(hass, -1, optional)
+
+        gc.collect()
+        tracemalloc.start()
+        baseline = tracemalloc.take_snapshot()
+        started = time.perf_counter()
+
+        built = [_build_boiler(hass, i, optional) for i in range(boilers)]
+
+        elapsed = time.perf_counter() - started
+        gc.collect()
+        stats = tracemalloc.take_snapshot().compare_to(baseline, "filename")
+        tracemalloc.stop()
+
+        await hass.async_stop(force=True)
+
+    allocated = sum(stat.size_diff for stat in stats)
+    entities = len(built[0]) - 1 if built else 0
+
+    print(f"boilers            : {boilers}")
+    print(f"optional entities  : {', '.join(optional) or '-'}")
+    print(f"entities per boiler: {entities}")
+    print(f"memory per boiler  : {allocated / boilers / 1024:.1f} KiB")
+    print(f"setup per boiler   : {elapsed / boilers * 1e3:.2f} ms")
+    print("top allocations:")
+    for stat in stats[:5]:
+        print(f"  {stat.size_diff / boilers / 1024:7.1f} KiB  {stat.traceback[0].filename}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--boilers", type=int, default=100)
+    parser.add_argument(
+        "--optional", default="", help="comma-separated optional entity groups (cost, flow_filtered)"
+    )
+    args = parser.parse_args()
+
+    optional = [group for group in args.optional.split(",") if group]
+    asyncio.run(async_run(args.boilers, optional))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Accelerated-time simulation and load test for the fioul boiler coordinator.
+
+Drives real ``FioulBoilerCoordinator`` instances inside a bare Home Assistant
+core with synthetic power traces and a virtual clock. Requires a Home
+Assistant development environment; run from the repository root:
+
+    python scripts/simulate.py --hours 48 --speed 1000
+    python scripts/simulate.py --boilers 300 --hours 6 --speed 0   # load test
+
+``--speed 0`` runs as fast as possible and reports the per-tick cost.
+
+The virtual clock does not drive Home Assistant's time listeners, so the
+harness calls the coordinators' midnight handler itself whenever the
+virtual clock crosses local midnight; the daily summary events are
+collected and reported next to the liters booked.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "custom_components"))
+
+from homeassistant.core import Event, HomeAssistant, callback  # noqa: E402
+from homeassistant.util import dt as dt_util  # noqa: E402
+
+from fioul_boiler.const import (  # noqa: E402
+    CONF_POWER_SENSORS,
+    CONF_SOURCE_WEIGHTS,
+    EVENT_DAILY_SUMMARY,
+)
+from fioul_boiler.coordinator import FioulBoilerCoordinator  # noqa: E402
+from synthetic_boiler import SyntheticBoiler  # noqa: E402
+
+
+class VirtualClock:
+    """UTC clock advanced explicitly by the harness."""
+
+    def __init__(self, start: datetime) -> None:
+        self.current = start
+
+    def now(self) -> datetime:
+        return self.current
+
+
+class SimulatedBoiler:
+    """One synthetic power plug plus the coordinator consuming it."""
+
+    def __init__(self, hass: HomeAssistant, index: int, clock: VirtualClock, seed: int) -> None:
+        self.entity_id = f"sensor.sim_boiler_{index}_power"
+        self.generator = SyntheticBoiler(seed=seed)
+        self.readings = self.generator.readings()
+
+        entry = SimpleNamespace(
+            entry_id=f"sim_{index}",
+            title=f"Simulated boiler {index}",
+            data={
+                CONF_POWER_SENSORS: [self.entity_id],
+                CONF_SOURCE_WEIGHTS: {self.entity_id: 1.0},
+            },
+            options={},
+        )
+        self.coordinator = FioulBoilerCoordinator(hass, entry, clock=clock.now)
+        self.unsub = self.coordinator.async_start_sources()
+
+        self.liters = 0.0
+        self.phc_trips = 0
+        self.absence_trips = 0
+        self._prev_phc = False
+        self._prev_absence = False
+
+    async def async_tick(self, hass: HomeAssistant) -> None:
+        hass.states.async_set(self.entity_id, next(self.readings), {"unit_of_measurement": "W"})
+        await self.coordinator.async_refresh()
+
+        data = self.coordinator.data or {}
+        self.liters += data.get("delta_liters", 0.0)
+        if data.get("error_phc") and not self._prev_phc:
+            self.phc_trips += 1
+        if data.get("error_absence") and not self._prev_absence:
+            self.absence_trips += 1
+        self._prev_phc = bool(data.get("error_phc"))
+        self._prev_absence = bool(data.get("error_absence"))
+
+
+async def async_run(boilers: int, hours: float, speed: float, seed: int) -> None:
+    with tempfile.TemporaryDirectory() as config_dir:
+        try:
+            hass = HomeAssistant(config_dir)
+        except TypeError:  # ältere Core-Versionen
+            hass = HomeAssistant()
+            hass.config.config_dir = config_dir
+
+        clock = VirtualClock(datetime(2025, 1, 1, tzinfo=timezone.utc))
+        sims = [SimulatedBoiler(hass, i, clock, seed + i) for i in range(boilers)]
+
+        summaries: list[dict] = []
+
+        @callback
+        def _async_summary(event: Event) -> None:
+            summaries.append(event.data)
+
+        unsub_summary = hass.bus.async_listen(EVENT_DAILY_SUMMARY, _async_summary)
+        local_day = dt_util.as_local(clock.current).date()
+
+        ticks = int(hours * 3600)
+        tick_real = 1.0 / speed if speed > 0 else 0.0
+        started = time.perf_counter()
+        busy = 0.0
+
+        for tick in range(ticks):
+            tick_start = time.perf_counter()
+            for sim in sims:
+                await sim.async_tick(hass)
+            busy += time.perf_counter() - tick_start
+            clock.current += timedelta(seconds=1)
+
+            # Mitternacht der virtuellen Uhr: Tageszusammenfassung auslösen
+            day = dt_util.as_local(clock.current).date()
+            if day != local_day:
+                local_day = day
+                for sim in sims:
+                    sim.coordinator._async_midnight(clock.current)
+
+            if tick_real:
+                delay = started + (tick + 1) * tick_real - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+        elapsed = time.perf_counter() - started
+        await hass.async_block_till_done()
+        unsub_summary()
+        for sim in sims:
+            sim.unsub()
+        await hass.async_stop(force=True)
+
+    injected_failures = sum(sim.generator.injected["failed_ignition"] for sim in sims)
+    phc_trips = sum(sim.phc_trips for sim in sims)
+
+    print(f"boilers            : {boilers}")
+    print(f"virtual time       : {hours:g} h ({ticks} ticks)")
+    print(f"achieved speed     : {ticks / elapsed:.0f}x real time")
+    print(f"cost per tick      : {busy / ticks / boilers * 1e6:.1f} µs per boiler")
+    print(f"burn cycles        : {sum(sim.generator.injected['cycles'] for sim in sims)}")
+    print(f"liters booked      : {sum(sim.liters for sim in sims):.2f}")
+    print(f"failed ignitions   : {injected_failures}")
+    print(f"PHC trips          : {phc_trips}")
+    print(f"absence trips      : {sum(sim.absence_trips for sim in sims)}")
+    print(f"source dropouts    : {sum(sim.generator.injected['dropouts'] for sim in sims)}")
+    print(f"daily summaries    : {len(summaries)}")
+    print(f"liters in summaries: {sum(summary['liters'] for summary in summaries):.2f}")
+
+    if phc_trips < injected_failures:
+        print("WARNING: not every injected ignition failure tripped PHC")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--boilers", type=int, default=1)
+    parser.add_argument("--hours", type=float, default=24.0)
+    parser.add_argument("--speed", type=float, default=1000.0, help="x real time, 0 = unthrottled")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    asyncio.run(async_run(args.boilers, args.hours, args.speed, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from typing import Iterator
+import random
+
+from homeassistant.const import STATE_UNAVAILABLE
+
+# Typische Leistungsaufnahme je Phase (W), passend zu DEFAULT_THRESHOLDS
+DEFAULT_LEVELS: dict[str, float] = {
+    "arret": 0.5,
+    "nuit": 5.0,
+    "pompe": 60.0,
+    "prechauffage": 120.0,
+    "postcirc": 175.0,
+    "burn": 260.0,
+}
+
+
+class SyntheticBoiler:
+    """
+    Synthetic power trace of an oil boiler, one reading per second.
+
+    Ablauf eines Zyklus: Pumpe → Vorwärmung → Brenner → Nachlauf → Pumpe.
+    Zwischendurch Nacht-/Urlaubsphasen. Injizierbare Störungen:
+
+    - ``ignition_failure_rate``: Vorwärmung ohne anschließenden Brenner
+      (muss den PHC-Fehler auslösen),
+    - ``dropout_rate``: Quelle kurzzeitig ``unavailable`` (WLAN-Steckdose),
+    - ``noise_w``: gaußsches Rauschen auf jedem Messwert.
+
+    Gezählte Ereignisse stehen in ``injected``; der Generator ist mit
+    ``seed`` reproduzierbar.
+    """
+
+    def __init__(
+        self,
+        seed: int | None = None,
+        levels: dict[str, float] | None = None,
+        noise_w: float = 3.0,
+        ignition_failure_rate: float = 0.02,
+        dropout_rate: float = 0.0002,
+        night_rate: float = 0.05,
+    ) -> None:
+        self._rng = random.Random(seed)
+        self.levels = {**DEFAULT_LEVELS, **(levels or {})}
+        self.noise_w = noise_w
+        self.ignition_failure_rate = ignition_failure_rate
+        self.dropout_rate = dropout_rate
+        self.night_rate = night_rate
+
+        self.injected: dict[str, int] = {
+            "cycles": 0,
+            "failed_ignition": 0,
+            "dropouts": 0,
+            "nights": 0,
+        }
+
+    def _phases(self) -> Iterator[tuple[str, int]]:
+        """Endless sequence of ``(phase, duration_s)``."""
+        rng = self._rng
+        while True:
+            if rng.random() < self.night_rate:
+                self.injected["nights"] += 1
+                yield "nuit", rng.randint(3600, 3 * 3600)
+                yield "arret", rng.randint(5, 30)
+
+            yield "pompe", rng.randint(10 * 60, 30 * 60)
+            yield "prechauffage", rng.randint(25, 45)
+
+            if rng.random() < self.ignition_failure_rate:
+                self.injected["failed_ignition"] += 1
+                continue
+
+            self.injected["cycles"] += 1
+            yield "burn", rng.randint(5 * 60, 15 * 60)
+            yield "postcirc", rng.randint(60, 180)
+
+    def readings(self) -> Iterator[str]:
+        """Endless per-second source states, as a power plug would report them."""
+        rng = self._rng
+        levels = self.levels
+        noise_w = self.noise_w
+        dropout_left = 0
+
+        for phase, duration in self._phases():
+            level = levels[phase]
+            for _ in range(duration):
+                if dropout_left:
+                    dropout_left -= 1
+                    yield STATE_UNAVAILABLE
+                    continue
+                if rng.random() < self.dropout_rate:
+                    self.injected["dropouts"] += 1
+                    dropout_left = rng.randint(5, 60)
+
+                # Rauschen nur auf Pumpen-/Brennerphasen, Standby bleibt stabil
+                power = level + rng.gauss(0.0, noise_w) if level >= 50.0 else level
+                yield f"{max(power, 0.0):.1f}"